@@ -1,5 +1,6 @@
 import streamlit as st
-from difflib import SequenceMatcher
+
+from chat_matcher import FuzzyMatcher
 
 # Page config
 st.set_page_config(
@@ -144,9 +145,8 @@ keywords = {
     'track_multiple': ['multiple applications', 'track multiple', 'several applications'],
 }
 
-def similarity_score(str1, str2):
-    """Calculate similarity between two strings"""
-    return SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
+# Indexed similarity lookup over all keyword phrases
+fuzzy_matcher = FuzzyMatcher(keywords, threshold=0.5)
 
 def find_answer(question):
     """Find answer using keyword matching and similarity scoring"""
@@ -165,12 +165,10 @@ def find_answer(question):
     
     # If no good match, try similarity scoring
     if best_score < 0.3:
-        for category, words in keywords.items():
-            for word in words:
-                score = similarity_score(q, word)
-                if score > best_score and score > 0.5:
-                    best_score = score
-                    best_match = category
+        score, category = fuzzy_matcher.best_match(q)
+        if category:
+            best_score = score
+            best_match = category
     
     if best_match:
         return knowledge_base[best_match]
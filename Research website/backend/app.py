@@ -1,28 +1,165 @@
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-import joblib
 import numpy as np
-import pandas as pd
+import asyncio
+import contextvars
+import functools
+import hmac
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-app = Flask(__name__)
-CORS(app)  # Enable CORS for React frontend
+from artifacts import is_fresh, load_mmap, mmap_path_for
+from content_catalog import ContentCatalog
+from feature_encoder import FeatureEncoder
+from forest_engine import ForestEngine
+from json_provider import FastJSONProvider, dumps_bytes, json_response, loads as json_loads, object_bytes, success_bytes
+from hospital_directory import HOSPITAL_TYPES, HospitalDirectory
+from kmeans_assigner import KMeansAssigner
+from metrics import MetricsRegistry
+from prediction_cache import PredictionCache
+from registry import ModelRegistry
+from schemas import Field, Schema
+from specialist_index import SpecialistIndex
+from structured_logging import configure_logging, get_logger
+from table_cache import load_table
+from treatment_matcher import TreatmentMatcher
+
+# JSON log lines written off the request thread; see structured_logging for LOG_* settings
+logging_pipeline = configure_logging()
+log = get_logger('backend')
+
+# All routes live on this blueprint; create_app() mounts it on a Flask app
+api = Blueprint('api', __name__)
 
 # Get the base path for models
 MODELS_PATH = os.path.join(os.path.dirname(__file__), 'models')
 
-# Load the trained model and encoders
-model = joblib.load(os.path.join(MODELS_PATH, 'welfare_model.pkl'))
-encoders = joblib.load(os.path.join(MODELS_PATH, 'all_encoders.pkl'))
+# Investment models live in the backend folder, not the models subfolder
+BACKEND_PATH = os.path.dirname(__file__)
 
-# Load doctor and hospital data
-doctors_df = pd.read_csv(os.path.join(MODELS_PATH, 'All_Doctor list.csv'), encoding='latin-1')
-hospitals_df = pd.read_csv(os.path.join(MODELS_PATH, 'All_Hospital list.csv'), encoding='latin-1')
+# Engine used to score the welfare model: 'native' (forest flattened into NumPy arrays,
+# no per-call scikit-learn overhead) or 'sklearn'. Falls back to scikit-learn if export fails.
+INFERENCE_ENGINE = os.environ.get('WELFARE_INFERENCE_ENGINE', 'native').lower()
 
-# Load investment models (in backend folder, not models subfolder)
-BACKEND_PATH = os.path.dirname(__file__)
-investment_encoders = joblib.load(os.path.join(BACKEND_PATH, '1.pkl'))
-investment_kmeans = joblib.load(os.path.join(BACKEND_PATH, '2.pkl'))
+# 'eager' starts loading every artifact in the background at import; 'lazy' loads each on first use
+ARTIFACT_LOADING = os.environ.get('ARTIFACT_LOADING', 'eager').lower()
+
+# Use the memory-mapped copies written by convert_artifacts.py when they are up to date,
+# so worker processes share one copy of the model arrays. Set MMAP_ARTIFACTS=0 to ignore them.
+MMAP_ARTIFACTS = os.environ.get('MMAP_ARTIFACTS', '1').lower() not in ('0', 'false', 'no')
+
+# Load the reference CSVs from the columnar caches in models/.cache, re-ingesting a CSV
+# only when its contents change. Set TABLE_CACHE=0 to parse the CSVs on every start.
+TABLE_CACHE = os.environ.get('TABLE_CACHE', '1').lower() not in ('0', 'false', 'no')
+
+WELFARE_MODEL_PATH = os.path.join(MODELS_PATH, 'welfare_model.pkl')
+KMEANS_PATH = os.path.join(BACKEND_PATH, '2.pkl')
+
+# Seconds between checks of models/ and the investment models for changes (0 disables the watcher)
+MODEL_WATCH_INTERVAL = float(os.environ.get('MODEL_WATCH_INTERVAL', 0))
+
+# Per-stage latency histograms served at /api/metrics; METRICS_ENABLED=0 turns every span into a no-op.
+# With METRICS_DIR set (serve.py sets it), every worker process's histograms are summed there
+metrics = MetricsRegistry(
+    enabled=os.environ.get('METRICS_ENABLED', '1').lower() not in ('0', 'false', 'no'),
+    directory=os.environ.get('METRICS_DIR') or None,
+    flush_interval=float(os.environ.get('METRICS_FLUSH_INTERVAL', 1.0))
+)
+recommend_latency = metrics.histogram(
+    'recommend_stage_seconds', 'Latency of each /api/recommend stage in seconds', 'stage')
+
+# Token expected in the X-Admin-Token header by admin endpoints; they are disabled when unset
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+def load_joblib(path):
+    import joblib
+    return joblib.load(path)
+
+def load_csv(path):
+    """A reference table, from its columnar cache unless TABLE_CACHE=0"""
+    return load_table(path, use_cache=TABLE_CACHE)
+
+def use_mmap(source_path):
+    """True if the memory-mapped copy of a .pkl artifact should be loaded instead"""
+    return MMAP_ARTIFACTS and is_fresh(mmap_path_for(source_path), source_path)
+
+def load_model(source_path):
+    """Load a .pkl artifact, preferring its memory-mapped copy"""
+    if use_mmap(source_path):
+        return load_mmap(mmap_path_for(source_path), source_path)
+    return load_joblib(source_path)
+
+def build_inference_engine(model):
+    """Return the object whose predict_proba scores applicants"""
+    if INFERENCE_ENGINE == 'native':
+        try:
+            return ForestEngine.from_sklearn(model)
+        except Exception as e:
+            log.warning("Native forest export failed, using scikit-learn", error=str(e))
+    return model
+
+def prediction_warmup_enabled():
+    return os.environ.get('PREDICTION_WARMUP', '').lower() in ('1', 'true', 'yes')
+
+def build_prediction_cache(scoring_model, encoders, model=None):
+    """Memoized eligibility predictions per distinct encoded feature row"""
+    cache = PredictionCache(scoring_model, maxsize=int(os.environ.get('PREDICTION_CACHE_SIZE', 4096)))
+    if prediction_warmup_enabled():
+        # Pre-score every realistic applicant (age 0-110, family size 1-15, all categorical values)
+        cache.warm(
+            ages=range(0, 111),
+            sex_codes=range(len(encoders['sex'].classes_)),
+            family_sizes=range(1, 16),
+            # 50000 is the fallback for an unrecognised income range
+            incomes=list(INCOME_MAPPING.values()) + [50000],
+            education_codes=range(len(encoders['education'].classes_)),
+            employment_codes=range(len(encoders['employment'].classes_)),
+            # scikit-learn's compiled traversal is the faster choice for one large pass
+            model=model if model is not None else scoring_model
+        )
+    return cache
+
+def build_feature_encoder(encoders):
+    """Form value → model code tables for the categorical fields"""
+    return FeatureEncoder(encoders, {
+        'sex': (SEX_FORM_TO_ENCODER, 'M'),
+        'education': (EDUCATION_FORM_TO_ENCODER, 'Secondary'),
+        'employment': (EMPLOYMENT_FORM_TO_ENCODER, 'Employed')
+    })
+
+def register_artifacts(artifacts):
+    """Models, encoders and reference tables, loaded in parallel and on demand per endpoint.
+
+    Called again for every reload, so the memory-mapped copies are only used while fresh.
+    """
+    artifacts.register('encoders', lambda: load_joblib(os.path.join(MODELS_PATH, 'all_encoders.pkl')))
+    artifacts.register('feature_encoder', build_feature_encoder, depends=['encoders'])
+    if INFERENCE_ENGINE == 'native' and use_mmap(WELFARE_MODEL_PATH):
+        # The converted forest is already a ForestEngine; the scikit-learn model is only loaded if asked for
+        artifacts.register('welfare_model', lambda: load_joblib(WELFARE_MODEL_PATH), preload=False)
+        artifacts.register('scoring_model', lambda: load_mmap(mmap_path_for(WELFARE_MODEL_PATH), WELFARE_MODEL_PATH))
+        # Only a warmup pass needs the scikit-learn model
+        warmup_model = ['welfare_model'] if prediction_warmup_enabled() else []
+        artifacts.register('prediction_cache', build_prediction_cache, depends=['scoring_model', 'encoders'] + warmup_model)
+    else:
+        artifacts.register('welfare_model', lambda: load_joblib(WELFARE_MODEL_PATH))
+        artifacts.register('scoring_model', build_inference_engine, depends=['welfare_model'])
+        artifacts.register('prediction_cache', build_prediction_cache, depends=['scoring_model', 'encoders', 'welfare_model'])
+    # The doctor list is served from an inverted index
+    artifacts.register('specialist_index', lambda: SpecialistIndex(os.path.join(MODELS_PATH, 'All_Doctor list.csv'), load_csv))
+    artifacts.register('hospitals_df', lambda: load_csv(os.path.join(MODELS_PATH, 'All_Hospital list.csv')))
+    artifacts.register('district_centroids', lambda: load_csv(os.path.join(MODELS_PATH, 'district_centroids.csv')))
+    artifacts.register('hospital_directory', HospitalDirectory, depends=['hospitals_df', 'district_centroids'])
+    artifacts.register('investment_encoders', lambda: load_joblib(os.path.join(BACKEND_PATH, '1.pkl')))
+    artifacts.register('investment_kmeans', lambda: load_model(KMEANS_PATH))
+    artifacts.register('investment_segmenter', KMeansAssigner.from_sklearn, depends=['investment_kmeans'])
+    # Condition keyword rules compiled into one matcher
+    artifacts.register('treatment_matcher', lambda: TreatmentMatcher.load(os.path.join(MODELS_PATH, 'treatment_rules.json')))
+    # Static messages, steps and investment plans, pre-serialized per outcome/segment
+    artifacts.register('content_catalog', lambda: ContentCatalog(os.path.join(MODELS_PATH, 'content_catalog.json')))
+
+# Artifacts in versioned generations; POST /api/admin/reload (or the file watcher) swaps in a new one
+registry = ModelRegistry(register_artifacts, max_workers=int(os.environ.get('ARTIFACT_LOAD_THREADS', 4)))
 
 # Mapping from form values to encoder values
 SEX_FORM_TO_ENCODER = {
@@ -50,301 +187,718 @@ EMPLOYMENT_FORM_TO_ENCODER = {
     'unable-to-work': 'Unemployed'
 }
 
+# Monthly income ranges from the form, mapped to a representative amount (LKR)
+INCOME_MAPPING = {
+    'below-25000': 15000,
+    '25000-50000': 37500,
+    '50000-100000': 75000,
+    '100000-200000': 150000,
+    'above-200000': 250000
+}
+
+# Request bodies, validated and coerced in one pass before any work is done
+RECOMMEND_SCHEMA = Schema([
+    Field('age', int, default=0, minimum=0, maximum=120),
+    Field('gender', str, default='male', max_length=50),
+    Field('familySize', int, default=1, minimum=1, maximum=50),
+    Field('district', str, default='colombo', max_length=100),
+    Field('monthlyIncome', str, default='25000-50000', max_length=50),
+    Field('educationLevel', str, default='secondary', max_length=50),
+    Field('employmentStatus', str, default='employed', max_length=50),
+    Field('medicalCondition', str, default='', max_length=200),
+    Field('symptoms', str, default='', max_length=500),
+    Field('symptomsDescription', str, default='', max_length=2000)
+], max_bytes=16384)
+
+# Upper bound for amounts in LKR; keeps derived figures well inside 64-bit integers
+MAX_AMOUNT = 1e12
+
+# Fields the investment KMeans segments on
+INVESTOR_FIELDS = [
+    Field('age', int, default=30, minimum=0, maximum=120),
+    Field('monthlyIncome', float, default=50000, minimum=0, maximum=MAX_AMOUNT)
+]
+
+INVESTMENT_SCHEMA = Schema(INVESTOR_FIELDS + [
+    Field('savingsAmount', float, default=100000, minimum=0, maximum=MAX_AMOUNT),
+    Field('investmentGoal', str, default='wealth-growth', max_length=50),
+    Field('riskTolerance', str, default='moderate', max_length=50),
+    Field('investmentDuration', str, default='medium', max_length=50)
+], max_bytes=8192)
+
+# One record of a batch segmentation request
+SEGMENT_SCHEMA = Schema(INVESTOR_FIELDS)
+
+# Where to search from: coordinates, or a district's centroid
+LOCATION_FIELDS = [
+    Field('latitude', float, minimum=-90, maximum=90),
+    Field('longitude', float, minimum=-180, maximum=180),
+    Field('district', str, max_length=100)
+]
+
+NEAREST_HOSPITALS_SCHEMA = Schema(LOCATION_FIELDS + [
+    Field('type', str, default='', max_length=20),
+    Field('limit', int, default=5, minimum=1, maximum=50)
+], max_bytes=4096)
+
+# One point of a batch nearest-hospital request
+LOCATION_SCHEMA = Schema(LOCATION_FIELDS)
+
+# Sinhala characters take three UTF-8 bytes, or six when sent \u-escaped
+CHAT_SCHEMA = Schema([
+    Field('message', str, default='', max_length=1000),
+    Field('language', str, default='en', max_length=20)
+], max_bytes=8192)
+
+# Applicants per vectorized pass in streaming batch endpoints
+BATCH_CHUNK_SIZE = 10000
+
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+def describe_errors(errors):
+    """Schema errors as one message, for the error slot of a batch record"""
+    return '; '.join(f"{e['field']}: {e['message']}" if e['field'] else e['message'] for e in errors)
+
+def read_request(schema):
+    """
+    Validate the JSON body against a schema. Returns (values, None) or (None, error response).
+    Oversized bodies are rejected from Content-Length, or after reading just past the limit.
+    """
+    if request.content_length is not None and request.content_length > schema.max_bytes:
+        body = None
+    else:
+        body = request.stream.read(schema.max_bytes + 1)
+    if body is None or len(body) > schema.max_bytes:
+        return None, (jsonify({
+            'success': False,
+            'error': f'Request body too large (limit {schema.max_bytes} bytes)'
+        }), 413)
+
+    values, errors = schema.parse(body)
+    if errors:
+        return None, (jsonify({'success': False, 'error': 'Invalid request', 'errors': errors}), 400)
+    return values, None
+
+# Shown when nothing matches, or when a lookup times out in /api/recommend/async
+DEFAULT_SPECIALISTS = [
+    {'specialist': 'General Practitioner', 'treats': 'General health conditions, initial consultations', 'matchScore': 0},
+    {'specialist': 'Internal Medicine Specialist', 'treats': 'General adult medical conditions', 'matchScore': 0}
+]
+
+DEFAULT_TREATMENTS = [
+    'Complete blood count (CBC) and basic metabolic panel',
+    'Physical examination by a general physician',
+    'Diagnostic tests based on symptoms',
+    'Medication as prescribed by doctor',
+    'Follow-up appointment for monitoring'
+]
+
+DEFAULT_HOSPITALS = [
+    {'name': 'District General Hospital', 'type': 'Government', 'note': 'Visit your nearest district hospital'},
+    {'name': 'Local Private Hospital', 'type': 'Private', 'note': 'Contact local healthcare providers'}
+]
+
 def find_specialists(medical_condition, symptoms):
     """Find relevant specialists based on medical condition and symptoms"""
-    search_terms = f"{medical_condition} {symptoms}".lower()
-    matching_specialists = []
-    
-    for _, row in doctors_df.iterrows():
-        diseases = str(row['Diseases_Treated']).lower()
-        matched_terms = [term for term in search_terms.split() if len(term) > 2 and term in diseases]
-        if matched_terms:
-            matching_specialists.append({
-                'specialist': row['Specialist'],
-                'treats': row['Diseases_Treated'][:150] + '...' if len(str(row['Diseases_Treated'])) > 150 else row['Diseases_Treated'],
-                'matchScore': len(matched_terms)
-            })
-    
-    # Sort by match score (best matches first)
-    matching_specialists.sort(key=lambda x: x['matchScore'], reverse=True)
+    specialist_index = registry.get('specialist_index')
+    # One stat per search: an edited doctor list starts loading a new generation in the
+    # background (once per edit, even if that load fails); this request uses the current one
+    signature = specialist_index.changed_signature()
+    if signature is not None and registry.reload(wait=False) is not None:
+        specialist_index.reload_requested_for = signature
+    matching_specialists = specialist_index.search(f"{medical_condition} {symptoms}", limit=5)
     
     # If no matches, return general practitioners
     if not matching_specialists:
-        matching_specialists = [
-            {'specialist': 'General Practitioner', 'treats': 'General health conditions, initial consultations', 'matchScore': 0},
-            {'specialist': 'Internal Medicine Specialist', 'treats': 'General adult medical conditions', 'matchScore': 0}
-        ]
+        matching_specialists = DEFAULT_SPECIALISTS
     
-    return matching_specialists[:5]  # Return top 5
+    return matching_specialists  # Top 5
 
 def get_treatment_recommendations(medical_condition, symptoms):
     """Generate treatment recommendations based on condition and symptoms"""
-    condition_lower = medical_condition.lower()
-    symptoms_lower = symptoms.lower()
-    
-    treatments = []
-    
-    # Common condition-based treatments
-    treatment_mapping = {
-        'diabetes': [
-            'Blood sugar monitoring and HbA1c tests',
-            'Dietary consultation with a nutritionist',
-            'Oral medication or insulin therapy as prescribed',
-            'Regular foot and eye examinations',
-            'Lifestyle modifications and exercise program'
-        ],
-        'heart': [
-            'ECG and echocardiogram tests',
-            'Blood pressure monitoring',
-            'Cholesterol management medication',
-            'Cardiac rehabilitation program',
-            'Stress management and dietary changes'
-        ],
-        'hypertension': [
-            'Regular blood pressure monitoring',
-            'Antihypertensive medication as prescribed',
-            'Low-sodium diet plan',
-            'Regular cardiovascular exercise',
-            'Stress reduction techniques'
-        ],
-        'fever': [
-            'Blood tests to identify infection',
-            'Antipyretic medication (paracetamol)',
-            'Rest and adequate hydration',
-            'Monitor temperature regularly',
-            'Seek immediate care if fever persists over 3 days'
-        ],
-        'pain': [
-            'Physical examination to identify source',
-            'Pain management medication',
-            'Physiotherapy if musculoskeletal',
-            'Imaging tests if needed (X-ray, MRI)',
-            'Follow-up consultation based on diagnosis'
-        ],
-        'respiratory': [
-            'Chest X-ray and pulmonary function tests',
-            'Bronchodilator or inhaler therapy',
-            'Antibiotics if bacterial infection suspected',
-            'Steam inhalation and rest',
-            'Avoid smoking and pollutants'
-        ],
-        'skin': [
-            'Dermatological examination',
-            'Topical medications or creams',
-            'Allergy tests if needed',
-            'Skin biopsy for suspicious lesions',
-            'Sun protection and skincare routine'
-        ],
-        'mental': [
-            'Psychological assessment',
-            'Counseling or therapy sessions',
-            'Medication if recommended by psychiatrist',
-            'Support group participation',
-            'Stress management and lifestyle changes'
-        ],
-        'gastro': [
-            'Endoscopy or colonoscopy if needed',
-            'Dietary modifications',
-            'Antacids or proton pump inhibitors',
-            'Probiotic supplements',
-            'Stress reduction and regular meal times'
-        ]
-    }
-    
-    # Find matching treatments
-    for condition, treatment_list in treatment_mapping.items():
-        if condition in condition_lower or condition in symptoms_lower:
-            treatments.extend(treatment_list)
+    treatments = registry.get('treatment_matcher').match(medical_condition, symptoms)
     
     # Add general treatments if none found
     if not treatments:
-        treatments = [
-            'Complete blood count (CBC) and basic metabolic panel',
-            'Physical examination by a general physician',
-            'Diagnostic tests based on symptoms',
-            'Medication as prescribed by doctor',
-            'Follow-up appointment for monitoring'
-        ]
+        treatments = DEFAULT_TREATMENTS
     
-    return treatments[:6]  # Return up to 6 treatments
+    return treatments
 
 def find_hospitals(district, is_eligible):
     """Find hospitals in the user's district"""
-    # Normalize district name for matching
-    district_normalized = district.lower().replace('-', ' ').title()
-    
-    # Filter hospitals by district
-    district_hospitals = hospitals_df[hospitals_df['District'].str.lower() == district_normalized.lower()]
-    
-    if district_hospitals.empty:
-        # Try partial match
-        district_hospitals = hospitals_df[hospitals_df['District'].str.lower().str.contains(district.lower()[:4])]
-    
+    return select_hospitals(lookup_hospitals(district), is_eligible)
+
+def lookup_hospitals(district):
+    """The district's hospitals grouped by type, or None if the district is unknown"""
+    return registry.get('hospital_directory').lookup(district)
+
+def select_hospitals(entry, is_eligible):
+    """Hospitals to recommend from a district entry, depending on eligibility"""
     hospitals_list = []
     
-    if is_eligible:
-        # Prioritize government hospitals for eligible users
-        govt_hospitals = district_hospitals[district_hospitals['Type'] == 'Government']
-        private_hospitals = district_hospitals[district_hospitals['Type'] == 'Private']
-        
-        for _, row in govt_hospitals.head(3).iterrows():
-            hospitals_list.append({
-                'name': row['Hospital'],
-                'type': 'Government',
-                'note': 'Free/subsidized care available'
-            })
-        
-        for _, row in private_hospitals.head(2).iterrows():
-            hospitals_list.append({
-                'name': row['Hospital'],
-                'type': 'Private',
-                'note': 'Paid services'
-            })
-    else:
-        # Show all hospitals for non-eligible users
-        for _, row in district_hospitals.head(5).iterrows():
-            hospitals_list.append({
-                'name': row['Hospital'],
-                'type': row['Type'],
-                'note': 'Subsidized rates available' if row['Type'] == 'Government' else 'Paid services'
-            })
+    if entry:
+        if is_eligible:
+            # Prioritize government hospitals for eligible users
+            hospitals_list = entry['Government'] + entry['Private']
+        else:
+            # Show all hospitals for non-eligible users
+            hospitals_list = list(entry['All'])
     
     # If no hospitals found, provide general info
     if not hospitals_list:
-        hospitals_list = [
-            {'name': 'District General Hospital', 'type': 'Government', 'note': 'Visit your nearest district hospital'},
-            {'name': 'Local Private Hospital', 'type': 'Private', 'note': 'Contact local healthcare providers'}
-        ]
+        hospitals_list = DEFAULT_HOSPITALS
     
     return hospitals_list
 
-@app.route('/api/health', methods=['GET'])
+@api.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({'status': 'ok', 'message': 'Backend is running'})
 
-@app.route('/api/recommend', methods=['POST'])
+@api.route('/api/recommend', methods=['POST'])
+@recommend_latency.timed('total')
 def get_recommendations():
     """
     Receive form data and return ML model predictions with hospital/doctor recommendations
     """
     try:
-        data = request.json
-        print("Received data:", data)
-        
-        # Extract form data
-        age = int(data.get('age', 0))
-        gender = data.get('gender', 'male')
-        family_size = int(data.get('familySize', 1))
-        district = data.get('district', 'colombo')
-        medical_condition = data.get('medicalCondition', '')
-        symptoms = data.get('symptoms', '')
-        symptoms_description = data.get('symptomsDescription', '')
-        
-        # Handle income - convert from range to numeric
-        income_str = data.get('monthlyIncome', '25000-50000')
-        income_mapping = {
-            'below-25000': 15000,
-            '25000-50000': 37500,
-            '50000-100000': 75000,
-            '100000-200000': 150000,
-            'above-200000': 250000
-        }
-        monthly_income = income_mapping.get(income_str, 50000)
-        
-        # Encode categorical variables using the new encoders
-        sex_encoded = encoders['sex'].transform([SEX_FORM_TO_ENCODER.get(gender, 'M')])[0]
-        education_value = EDUCATION_FORM_TO_ENCODER.get(data.get('educationLevel', 'secondary'), 'Secondary')
-        education_encoded = encoders['education'].transform([education_value])[0]
-        employment_value = EMPLOYMENT_FORM_TO_ENCODER.get(data.get('employmentStatus', 'employed'), 'Employed')
-        employment_encoded = encoders['employment'].transform([employment_value])[0]
-        
-        # Create feature array: ['Age', 'Sex', 'Family_Size', 'Monthly_Income', 'Education_Level', 'Employment_Status']
-        features = np.array([[age, sex_encoded, family_size, monthly_income, education_encoded, employment_encoded]])
-        
-        print(f"Features: {features}")
+        with recommend_latency.time('parse'):
+            data, error = read_request(RECOMMEND_SCHEMA)
+            if error:
+                return error
+            
+            # Extract form data
+            age = data['age']
+            gender = data['gender']
+            family_size = data['familySize']
+            district = data['district']
+            medical_condition = data['medicalCondition']
+            symptoms = data['symptoms']
+            symptoms_description = data['symptomsDescription']
+            
+            # Handle income - convert from range to numeric
+            income_str = data['monthlyIncome']
+            monthly_income = INCOME_MAPPING.get(income_str, 50000)
         
-        # Get prediction
-        prediction = model.predict(features)[0]
-        probability = model.predict_proba(features)[0]
+        with recommend_latency.time('encode'):
+            # Encode categorical variables with the compiled encoder tables
+            feature_encoder = registry.get('feature_encoder')
+            sex_encoded = feature_encoder.encode('sex', gender)
+            education_encoded = feature_encoder.encode('education', data['educationLevel'])
+            employment_encoded = feature_encoder.encode('employment', data['employmentStatus'])
+            
+            # Create feature array: ['Age', 'Sex', 'Family_Size', 'Monthly_Income', 'Education_Level', 'Employment_Status']
+            features = np.array([[age, sex_encoded, family_size, monthly_income, education_encoded, employment_encoded]])
         
-        # Decode the prediction using welfare encoder
-        result = encoders['welfare'].inverse_transform([prediction])[0]
-        confidence = float(max(probability) * 100)
+        # Get prediction (one probability pass; label decoded with the welfare encoder)
+        with recommend_latency.time('inference'):
+            score = score_applicants(features)[0]
+        result = score['eligibility']
+        confidence = score['confidence']
         
-        print(f"Prediction: {result}, Confidence: {confidence}%")
+        log.info("Recommendation scored", data=data, features=features.tolist(), eligibility=result, confidence=confidence)
         
         is_eligible = result == 'Eligible'
         
         # Find relevant specialists based on medical condition
-        specialists = find_specialists(medical_condition, f"{symptoms} {symptoms_description}")
+        with recommend_latency.time('specialists'):
+            specialists = find_specialists(medical_condition, f"{symptoms} {symptoms_description}")
         
         # Find hospitals in user's district
-        hospitals = find_hospitals(district, is_eligible)
+        with recommend_latency.time('hospitals'):
+            hospitals = find_hospitals(district, is_eligible)
         
         # Get treatment recommendations
-        treatments = get_treatment_recommendations(medical_condition, f"{symptoms} {symptoms_description}")
+        with recommend_latency.time('treatments'):
+            treatments = get_treatment_recommendations(medical_condition, f"{symptoms} {symptoms_description}")
         
-        # Generate comprehensive recommendations
-        if is_eligible:
-            recommendations = {
-                'eligibility': 'Eligible',
-                'confidence': round(confidence, 1),
-                'message': 'Congratulations! Based on your information, you are eligible for health welfare services.',
-                'specialists': specialists,
-                'hospitals': hospitals,
-                'treatments': treatments,
-                'nextSteps': [
-                    'Visit your nearest Divisional Secretariat office',
-                    'Bring your National ID card and income proof',
-                    'Complete the official application form',
-                    'A social worker will verify your eligibility'
-                ],
-                'benefits': [
-                    'Free medical consultations at government hospitals',
-                    'Subsidized medications',
-                    'Free or reduced-cost treatments',
-                    'Priority access to specialist care'
-                ]
-            }
-        else:
-            recommendations = {
-                'eligibility': 'Not Eligible',
-                'confidence': round(confidence, 1),
-                'message': 'Based on your current information, you may not qualify for subsidized health welfare services. However, here are your healthcare recommendations:',
-                'specialists': specialists,
-                'hospitals': hospitals,
-                'treatments': treatments,
-                'alternatives': [
-                    'Consider private health insurance options',
-                    'Check with your employer for health benefits',
-                    'Government hospitals still offer subsidized rates',
-                    'Explore community health programs'
-                ],
-                'note': 'Eligibility criteria may change. Please visit your local Divisional Secretariat for a formal assessment.'
-            }
+        with recommend_latency.time('serialize'):
+            return recommendation_response(is_eligible, confidence, specialists, hospitals, treatments)
         
+    except Exception as e:
+        log.exception("Recommendation failed", error=str(e))
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def recommendation_response(is_eligible, confidence, specialists, hospitals, treatments):
+    """
+    Recommendation response body. Static outcome content (message, next steps,
+    benefits/alternatives) is pre-serialized in the content catalog; only the
+    per-applicant fields are encoded here.
+    """
+    recommendations = object_bytes([registry.get('content_catalog').outcome(is_eligible)], {
+        'confidence': round(confidence, 1),
+        'specialists': specialists,
+        'hospitals': hospitals,
+        'treatments': treatments
+    })
+    return json_response(success_bytes('recommendations', recommendations))
+
+# Bounded pool running the concurrent lookups of /api/recommend/async
+lookup_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('RECOMMEND_LOOKUP_WORKERS', 8)), thread_name_prefix='recommend-lookup')
+
+# Seconds a lookup may take before its fallback is used
+RECOMMEND_STAGE_TIMEOUT = float(os.environ.get('RECOMMEND_STAGE_TIMEOUT', 2.0))
+
+# run_stage fallback for stages whose failure must fail the request
+NO_FALLBACK = object()
+
+def timed_stage(stage, func, *args):
+    with recommend_latency.time(f'async_{stage}'):
+        return func(*args)
+
+async def run_stage(stage, func, *args, fallback=NO_FALLBACK):
+    """
+    Run a blocking lookup on the bounded pool with a timeout.
+    On timeout or error, return ``fallback`` (or raise if there is none).
+    """
+    loop = asyncio.get_running_loop()
+    # Run in a copy of this context, so the lookup reads the request's artifact generation
+    call = functools.partial(contextvars.copy_context().run, timed_stage, stage, func, *args)
+    try:
+        return await asyncio.wait_for(loop.run_in_executor(lookup_executor, call), RECOMMEND_STAGE_TIMEOUT)
+    except asyncio.TimeoutError:
+        if fallback is NO_FALLBACK:
+            raise
+        log.warning("Recommendation stage timed out, using fallback", stage=stage, timeout=RECOMMEND_STAGE_TIMEOUT)
+    except Exception as e:
+        if fallback is NO_FALLBACK:
+            raise
+        log.exception("Recommendation stage failed, using fallback", stage=stage, error=str(e))
+    return fallback
+
+@api.route('/api/recommend/async', methods=['POST'])
+async def get_recommendations_async():
+    """
+    Same request and response as /api/recommend, with model inference and the specialist,
+    hospital and treatment lookups running concurrently. A lookup that fails or exceeds
+    RECOMMEND_STAGE_TIMEOUT falls back to the general defaults; only the prediction itself
+    is required.
+    """
+    with recommend_latency.time('async_total'):
+        data, error = read_request(RECOMMEND_SCHEMA)
+        if error:
+            return error
+
+        try:
+            features = encode_applicants([parse_applicant(data)])
+            symptom_text = f"{data['symptoms']} {data['symptomsDescription']}"
+
+            # Hospitals are looked up by district now and picked by eligibility afterwards
+            scores, specialists, hospital_entry, treatments = await asyncio.gather(
+                run_stage('inference', score_applicants, features),
+                run_stage('specialists', find_specialists, data['medicalCondition'], symptom_text,
+                          fallback=DEFAULT_SPECIALISTS),
+                run_stage('hospitals', lookup_hospitals, data['district'], fallback=None),
+                run_stage('treatments', get_treatment_recommendations, data['medicalCondition'], symptom_text,
+                          fallback=DEFAULT_TREATMENTS)
+            )
+            score = scores[0]
+            is_eligible = score['eligibility'] == 'Eligible'
+            log.info("Recommendation scored", data=data, features=features.tolist(),
+                     eligibility=score['eligibility'], confidence=score['confidence'])
+
+            return recommendation_response(
+                is_eligible, score['confidence'], specialists, select_hospitals(hospital_entry, is_eligible), treatments)
+
+        except asyncio.TimeoutError:
+            log.error("Eligibility prediction timed out", timeout=RECOMMEND_STAGE_TIMEOUT)
+            return jsonify({
+                'success': False,
+                'error': 'Eligibility prediction timed out, please try again'
+            }), 503
+        except Exception as e:
+            log.exception("Recommendation failed", error=str(e))
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+
+def parse_applicant(data, feature_encoder=None):
+    """Encode one applicant record into a model feature row (raises ValueError on bad input)"""
+    if not isinstance(data, dict):
+        raise ValueError('Applicant record must be a JSON object')
+    tables = (feature_encoder or registry.get('feature_encoder')).tables
+
+    # Column order: ['Age', 'Sex', 'Family_Size', 'Monthly_Income', 'Education_Level', 'Employment_Status']
+    return (
+        int(data.get('age', 0)),
+        tables['sex'][data.get('gender', 'male')],
+        int(data.get('familySize', 1)),
+        INCOME_MAPPING.get(data.get('monthlyIncome', '25000-50000'), 50000),
+        tables['education'][data.get('educationLevel', 'secondary')],
+        tables['employment'][data.get('employmentStatus', 'employed')]
+    )
+
+def encode_applicants(rows):
+    """Model feature matrix for parsed applicant rows, built in one array conversion"""
+    return np.array(rows, dtype=np.int64)
+
+def score_applicants(matrix):
+    """
+    Score an encoded feature matrix with a single probability pass.
+    Returns one dict per row: decoded label, confidence (%) and the full class distribution (%).
+    """
+    probabilities = registry.get('prediction_cache').predict_proba(matrix)
+    best = probabilities.argmax(axis=1)
+    class_names = registry.get('feature_encoder').decode('welfare', registry.get('scoring_model').classes_)
+
+    return [
+        {
+            'eligibility': class_names[label],
+            'confidence': row[label] * 100,
+            'distribution': {name: p * 100 for name, p in zip(class_names, row)}
+        }
+        for label, row in zip(best, probabilities)
+    ]
+
+def score_records(records, start=0):
+    """
+    Score applicant records in one probability pass, in input order.
+    Each record is validated with RECOMMEND_SCHEMA, like a single /api/recommend body;
+    records that fail (or are exceptions already) become {'index', 'error'} entries.
+    """
+    results = [None] * len(records)
+    valid_indexes = []
+    valid_rows = []
+    feature_encoder = registry.get('feature_encoder')
+
+    for i, record in enumerate(records):
+        try:
+            if isinstance(record, Exception):
+                raise record
+            values, errors = RECOMMEND_SCHEMA.validate(record)
+            if errors:
+                raise ValueError(describe_errors(errors))
+            valid_rows.append(parse_applicant(values, feature_encoder))
+            valid_indexes.append(i)
+        except (TypeError, ValueError, OverflowError) as e:
+            results[i] = {'index': start + i, 'error': str(e)}
+
+    if valid_rows:
+        for i, score in zip(valid_indexes, score_applicants(encode_applicants(valid_rows))):
+            results[i] = dict(score, index=start + i)
+    return results
+
+def iter_ndjson(lines):
+    """Yield the record on each non-empty line; unparseable lines yield a ValueError in place"""
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json_loads(line)
+        except ValueError as e:
+            yield ValueError(f'Invalid JSON line: {e}')
+
+def iter_chunks(items, size):
+    """Yield (start index, list of up to ``size`` items)"""
+    chunk = []
+    start = 0
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield start, chunk
+            start += size
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+def read_batch_records(key='applicants'):
+    """Read records from a JSON array, an object with a ``key`` array, or an NDJSON request body.
+
+    Returns a list where unparseable NDJSON lines are replaced by their error message.
+    """
+    if request.mimetype in NDJSON_MIMETYPES:
+        return list(iter_ndjson(request.get_data(as_text=True).splitlines()))
+
+    data = request.get_json(force=True)
+    if isinstance(data, dict):
+        data = data.get(key)
+    if not isinstance(data, list):
+        raise ValueError(f'Expected a JSON array of {key} or an object with an "{key}" array')
+    return data
+
+@api.route('/api/recommend/batch', methods=['POST'])
+def get_batch_recommendations():
+    """
+    Score many applicants at once (JSON array or NDJSON body).
+    Invalid records are reported individually without failing the batch.
+    """
+    try:
+        records = read_batch_records()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    try:
+        results = score_records(records)
+        for result in results:
+            if 'error' not in result:
+                result['confidence'] = round(result['confidence'], 1)
+                result['distribution'] = {name: round(p, 1) for name, p in result['distribution'].items()}
+
         return jsonify({
             'success': True,
-            'recommendations': recommendations
+            'count': len(results),
+            'errors': sum('error' in result for result in results),
+            'results': results
         })
-        
+
+    except Exception as e:
+        log.exception("Batch scoring failed", error=str(e))
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def segment_records(records, start=0, segmenter=None, catalog=None):
+    """
+    Assign investment segments to records with one vectorized KMeans pass, in input order.
+    Invalid records (or exceptions already) become {'index', 'error'} entries.
+    """
+    segmenter = segmenter or registry.get('investment_segmenter')
+    catalog = catalog or registry.get('content_catalog')
+    results = [None] * len(records)
+    valid_indexes = []
+    valid_rows = []
+
+    for i, record in enumerate(records):
+        if isinstance(record, Exception):
+            results[i] = {'index': start + i, 'error': str(record)}
+            continue
+        values, errors = SEGMENT_SCHEMA.validate(record)
+        if errors:
+            results[i] = {
+                'index': start + i,
+                'error': describe_errors(errors)
+            }
+            continue
+        # Same features as investment_recommend: (income, age, neutral sex encoding)
+        valid_rows.append((values['monthlyIncome'], values['age'], 0.5))
+        valid_indexes.append(i)
+
+    if valid_rows:
+        for i, cluster in zip(valid_indexes, segmenter.assign(valid_rows).tolist()):
+            results[i] = {'index': start + i, 'cluster': cluster, **catalog.segment(cluster)}
+    return results
+
+@api.route('/api/investment-recommend/batch', methods=['POST'])
+def investment_segment_batch():
+    """
+    Segment many applicants for investment advice (NDJSON or JSON array body).
+    Streams one NDJSON result per record, in input order; NDJSON input is read
+    incrementally, so memory stays bounded however many rows are sent.
+    """
+    if request.mimetype in NDJSON_MIMETYPES:
+        records = iter_ndjson(request.stream)
+    else:
+        try:
+            records = read_batch_records()
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+
+    # Resolved now so the whole stream uses one artifact generation
+    segmenter = registry.get('investment_segmenter')
+    catalog = registry.get('content_catalog')
+
+    def generate():
+        for start, chunk in iter_chunks(records, BATCH_CHUNK_SIZE):
+            results = segment_records(chunk, start, segmenter, catalog)
+            yield b''.join(dumps_bytes(result) + b'\n' for result in results)
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+def resolve_hospital_type(value):
+    """'government'/'private' -> the directory's type name; '' or 'all' -> None (raises ValueError otherwise)"""
+    if value.lower() in ('', 'all'):
+        return None
+    for hospital_type in HOSPITAL_TYPES:
+        if value.lower() == hospital_type.lower():
+            return hospital_type
+    raise ValueError(f"type must be one of: all, {', '.join(t.lower() for t in HOSPITAL_TYPES)}")
+
+def resolve_origin(values, directory):
+    """(latitude, longitude) to search from: the given coordinates, else the district's centroid"""
+    if values['latitude'] is not None and values['longitude'] is not None:
+        return values['latitude'], values['longitude']
+    if values['district']:
+        origin = directory.centroid(values['district'])
+        if origin is None:
+            raise ValueError(f"Unknown district: {values['district']}")
+        return origin
+    raise ValueError('Provide latitude and longitude, or a district')
+
+def is_approximate(values, hospitals):
+    """True when the origin or any hospital was placed at a district centroid"""
+    from_district = values['latitude'] is None or values['longitude'] is None
+    return from_district or any(hospital['approximate'] for hospital in hospitals)
+
+@api.route('/api/hospitals/nearest', methods=['POST'])
+def nearest_hospitals():
+    """
+    The nearest hospitals to a point (latitude/longitude) or a district's centroid,
+    optionally only government or private ones. Hospitals without coordinates are
+    placed at their district's centroid, so distances are district-level; the response
+    is flagged ``approximate`` when the origin or any hospital is a centroid.
+    """
+    values, error = read_request(NEAREST_HOSPITALS_SCHEMA)
+    if error:
+        return error
+
+    directory = registry.get('hospital_directory')
+    try:
+        hospital_type = resolve_hospital_type(values['type'])
+        origin = resolve_origin(values, directory)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    try:
+        hospitals = directory.nearest([origin], values['limit'], hospital_type)[0]
+        return jsonify({
+            'success': True,
+            'origin': {'latitude': origin[0], 'longitude': origin[1]},
+            'approximate': is_approximate(values, hospitals),
+            'hospitals': hospitals
+        })
+
+    except Exception as e:
+        log.exception("Nearest hospital search failed", error=str(e))
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@api.route('/api/hospitals/nearest/batch', methods=['POST'])
+def nearest_hospitals_batch():
+    """
+    Nearest hospitals for many points at once (JSON array, {"points": [...]} or NDJSON body).
+    Each point has latitude/longitude or a district; ``limit`` and ``type`` come from the
+    query string. All points are searched in one vectorized query; invalid points are
+    reported individually without failing the batch. Each result carries the same
+    ``approximate`` flag as the single-point endpoint.
+    """
+    try:
+        records = read_batch_records('points')
+        hospital_type = resolve_hospital_type(request.args.get('type', ''))
+        limit = int(request.args.get('limit', 5))
+        if not 1 <= limit <= 50:
+            raise ValueError('limit must be between 1 and 50')
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    try:
+        directory = registry.get('hospital_directory')
+        results = [None] * len(records)
+        valid_indexes = []
+        valid_values = []
+        origins = []
+        for i, record in enumerate(records):
+            if isinstance(record, Exception):
+                results[i] = {'index': i, 'error': str(record)}
+                continue
+            values, errors = LOCATION_SCHEMA.validate(record)
+            try:
+                if errors:
+                    raise ValueError(describe_errors(errors))
+                origins.append(resolve_origin(values, directory))
+                valid_indexes.append(i)
+                valid_values.append(values)
+            except ValueError as e:
+                results[i] = {'index': i, 'error': str(e)}
+
+        for i, values, hospitals in zip(valid_indexes, valid_values, directory.nearest(origins, limit, hospital_type)):
+            results[i] = {'index': i, 'approximate': is_approximate(values, hospitals), 'hospitals': hospitals}
+
+        return jsonify({
+            'success': True,
+            'count': len(results),
+            'errors': sum('error' in result for result in results),
+            'results': results
+        })
+
     except Exception as e:
-        print(f"Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Batch nearest hospital search failed", error=str(e))
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+@api.before_request
+def pin_artifact_generation():
+    """Serve the whole request from one artifact generation, even if a reload swaps it midway"""
+    registry.pin()
+
+@api.teardown_request
+def unpin_artifact_generation(exc):
+    registry.unpin()
+
+@api.route('/api/artifacts', methods=['GET'])
+def artifact_status():
+    """Load status, load time and approximate memory of each model artifact"""
+    return jsonify({'success': True, **registry.status(), 'artifacts': registry.report()})
+
+@api.route('/api/admin/reload', methods=['POST'])
+def reload_artifacts():
+    """
+    Load a new generation of models and reference tables and swap it in.
+    In-flight requests finish on the old generation. Pass ?wait=1 to block until done.
+    Under serve.py's gunicorn, a successful reload is handed to the master, which loads
+    the generation itself and replaces every worker, so all of them serve it.
+    """
+    if not ADMIN_TOKEN:
+        return jsonify({'success': False, 'error': 'Admin endpoints are disabled (ADMIN_TOKEN not set)'}), 403
+    token = request.headers.get('X-Admin-Token', '')
+    if not hmac.compare_digest(token.encode('utf-8'), ADMIN_TOKEN.encode('utf-8')):
+        return jsonify({'success': False, 'error': 'Invalid admin token'}), 401
+    wait = request.args.get('wait', '').lower() in ('1', 'true', 'yes')
+    try:
+        generation = registry.reload(wait=wait, after=registry.after_api_reload)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+    if generation is None:
+        return jsonify({'success': False, 'error': 'A reload is already in progress', **registry.status()}), 409
+    if wait and registry.status()['generation'] != generation:
+        return jsonify({'success': False, 'error': registry.last_reload_error, **registry.status()}), 500
+    return jsonify({'success': True, **registry.status()}), 200 if wait else 202
+
+@api.route('/api/metrics', methods=['GET'])
+def prometheus_metrics():
+    """
+    Latency histograms in Prometheus text format. Totals cover every worker when
+    METRICS_DIR is shared (serve.py sets it), otherwise only the worker that answered.
+    """
+    if not metrics.enabled:
+        return jsonify({'success': False, 'error': 'Metrics are disabled (METRICS_ENABLED=0)'}), 404
+    return metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+@api.route('/api/recommend/cache', methods=['GET'])
+def prediction_cache_stats():
+    """Eligibility prediction cache statistics"""
+    return jsonify({'success': True, 'cache': registry.get('prediction_cache').stats()})
+
 # ============================================
 # CHATBOT FUNCTIONALITY
 # ============================================
 
-from difflib import SequenceMatcher
 import re
 
+from cache import LRUCache
+from chat_matcher import FuzzyMatcher, KeywordMatcher
+
 # Knowledge Base - English (Expanded)
 knowledge_base_en = {
     # Conversational responses
@@ -451,9 +1005,43 @@ knowledge_base_si = {
     'health': 'සෞඛ්‍ය සේවා මගින් නොමිලේ වෛද්‍ය උපදේශන, සහනාධාර ඖෂධ, රෝහල් ප්‍රතිකාර ආවරණය ලබා දේ.',
 }
 
-def similarity_score(str1, str2):
-    """Calculate similarity between two strings"""
-    return SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
+# Minimum similarity ratio (0-1) for the fuzzy fallback
+FUZZY_MATCH_THRESHOLD = float(os.environ.get('CHAT_FUZZY_THRESHOLD', 0.5))
+
+# Answer cache for repeated questions (size 0 disables it, TTL in seconds, 0 = no expiry)
+chat_cache = LRUCache(
+    maxsize=int(os.environ.get('CHAT_CACHE_SIZE', 1024)),
+    ttl=float(os.environ.get('CHAT_CACHE_TTL', 3600))
+)
+# Longer messages are answered without the cache, so its keys stay small
+CHAT_CACHE_MAX_LENGTH = int(os.environ.get('CHAT_CACHE_MAX_LENGTH', 256))
+# Bumped whenever the knowledge bases change so answers cached earlier are never served
+chat_generation = 0
+
+def compile_chatbot_matchers():
+    """Compile the keyword tables into single-pass and fuzzy matchers and invalidate cached answers"""
+    global keyword_matcher_en, keyword_matcher_si, fuzzy_matcher_en, fuzzy_matcher_si, chat_generation
+    keyword_matcher_en = KeywordMatcher(keywords_en)
+    keyword_matcher_si = KeywordMatcher(keywords_si)
+    fuzzy_matcher_en = FuzzyMatcher(keywords_en, FUZZY_MATCH_THRESHOLD)
+    fuzzy_matcher_si = FuzzyMatcher(keywords_si, FUZZY_MATCH_THRESHOLD)
+    chat_generation += 1
+    chat_cache.clear()
+
+def reload_chatbot_knowledge(knowledge_en=None, knowledge_keywords_en=None, knowledge_si=None, knowledge_keywords_si=None):
+    """Replace any of the chatbot knowledge bases / keyword tables and recompile the matchers"""
+    global knowledge_base_en, keywords_en, knowledge_base_si, keywords_si
+    if knowledge_en is not None:
+        knowledge_base_en = knowledge_en
+    if knowledge_keywords_en is not None:
+        keywords_en = knowledge_keywords_en
+    if knowledge_si is not None:
+        knowledge_base_si = knowledge_si
+    if knowledge_keywords_si is not None:
+        keywords_si = knowledge_keywords_si
+    compile_chatbot_matchers()
+
+compile_chatbot_matchers()
 
 def find_chatbot_answer(question, language='en'):
     """Find answer using improved keyword matching"""
@@ -464,65 +1052,61 @@ def find_chatbot_answer(question, language='en'):
     
     if language == 'si':
         knowledge_base = knowledge_base_si
-        keywords = keywords_si
+        matcher = keyword_matcher_si
+        fuzzy_matcher = fuzzy_matcher_si
         default_response = 'මට සමාවෙන්න, මම එම ප්‍රශ්නයට පිළිතුරු දැනගෙන නැහැ. කරුණාකර වෙනත් ආකාරයකින් අහන්න.'
     else:
         knowledge_base = knowledge_base_en
-        keywords = keywords_en
+        matcher = keyword_matcher_en
+        fuzzy_matcher = fuzzy_matcher_en
         default_response = "I'm sorry, I couldn't find a specific answer to that question. Here are some topics I can help with:\n\n• What programs are available?\n• Am I eligible for welfare?\n• How do I apply?\n• What documents are needed?\n• Health services information\n• Education support\n• Financial aid\n• How to contact support\n\nPlease try asking about one of these topics!"
     
-    best_match = None
-    best_score = 0
-    
     # Method 1: Exact phrase matching (highest priority)
-    for category, words in keywords.items():
-        for word in words:
-            if word in q_clean or word in q:
-                # Longer matches get higher scores
-                score = len(word) * 2
-                if score > best_score:
-                    best_score = score
-                    best_match = category
+    # Longer matches get higher scores
+    best_score, best_match = matcher.phrase_match(q, q_clean)
     
     # Method 2: Word-by-word matching
     if best_score < 10:
-        q_words = set(q_clean.split())
-        for category, words in keywords.items():
-            match_count = 0
-            for word in words:
-                word_parts = word.split()
-                for part in word_parts:
-                    if part in q_words:
-                        match_count += 1
-            if match_count > 0:
-                score = match_count * 3
-                if score > best_score:
-                    best_score = score
-                    best_match = category
+        score, category = matcher.word_match(set(q_clean.split()))
+        if score > best_score:
+            best_score = score
+            best_match = category
     
     # Method 3: Similarity matching for fuzzy matching
     if best_score < 5:
-        for category, words in keywords.items():
-            for word in words:
-                score = similarity_score(q_clean, word) * 10
-                if score > best_score and score > 5:
-                    best_score = score
-                    best_match = category
+        ratio, category = fuzzy_matcher.best_match(q_clean, max(FUZZY_MATCH_THRESHOLD, best_score / 10))
+        if category:
+            best_score = ratio * 10
+            best_match = category
     
     if best_match and best_match in knowledge_base:
         return knowledge_base[best_match]
     
     return default_response
 
-@app.route('/api/chat', methods=['POST'])
+def cached_chatbot_answer(question, language='en'):
+    """find_chatbot_answer with repeated questions served from chat_cache"""
+    language = 'si' if language == 'si' else 'en'
+    # Keyed on the lowercased message rather than q_clean: phrases such as "that's all"
+    # only match with their punctuation, so q_clean alone does not determine the answer
+    question_key = question.lower().strip()
+    if len(question_key) > CHAT_CACHE_MAX_LENGTH:
+        return find_chatbot_answer(question, language)
+    key = (chat_generation, question_key, language)
+    return chat_cache.get_or_compute(key, lambda: find_chatbot_answer(question, language))
+
+@api.route('/api/chat', methods=['POST'])
 def chat():
     """Chatbot endpoint"""
+    data, error = read_request(CHAT_SCHEMA)
+    if error:
+        return error
+
     try:
-        data = request.json
-        message = data.get('message', '')
-        language = data.get('language', 'en')
+        message = data['message']
+        language = data['language']
         
-        response = find_chatbot_answer(message, language)
+        response = cached_chatbot_answer(message, language)
         
         return jsonify({
             'success': True,
@@ -534,19 +1118,26 @@ def chat():
             'error': str(e)
         }), 500
 
+@api.route('/api/chat/cache', methods=['GET'])
+def chat_cache_stats():
+    """Chat answer cache statistics"""
+    return jsonify({'success': True, 'cache': chat_cache.stats()})
+
 # Investment Recommendation Endpoint
-@app.route('/api/investment-recommend', methods=['POST'])
+@api.route('/api/investment-recommend', methods=['POST'])
 def investment_recommend():
     try:
-        data = request.json
+        data, error = read_request(INVESTMENT_SCHEMA)
+        if error:
+            return error
         
         # Extract form data
-        age = int(data.get('age', 30))
-        monthly_income = float(data.get('monthlyIncome', 50000))
-        savings = float(data.get('savingsAmount', 100000))
-        investment_goal = data.get('investmentGoal', 'wealth-growth')
-        risk_tolerance = data.get('riskTolerance', 'moderate')
-        investment_duration = data.get('investmentDuration', 'medium')
+        age = data['age']
+        monthly_income = data['monthlyIncome']
+        savings = data['savingsAmount']
+        investment_goal = data['investmentGoal']
+        risk_tolerance = data['riskTolerance']
+        investment_duration = data['investmentDuration']
         
         # Prepare features for KMeans (income, age, encoded value)
         # Using sex encoding as placeholder - model expects 3 features
@@ -554,205 +1145,63 @@ def investment_recommend():
         features = np.array([[monthly_income, age, sex_encoded]])
         
         # Get cluster prediction (income-based segmentation)
-        cluster = investment_kmeans.predict(features)[0]
-        
-        # Define investment recommendations based on cluster and preferences
-        investment_plans = {
-            0: {  # Low income cluster (~31,000 LKR)
-                'segment': 'Conservative Saver',
-                'recommended_savings_rate': '15-20%',
-                'recommendations': [
-                    {
-                        'name': 'National Savings Bank Fixed Deposit',
-                        'type': 'Fixed Deposit',
-                        'risk': 'Low',
-                        'expected_return': '8-10% p.a.',
-                        'min_investment': 'Rs. 1,000',
-                        'description': 'Safe government-backed savings with guaranteed returns'
-                    },
-                    {
-                        'name': 'Employee Provident Fund (EPF)',
-                        'type': 'Retirement Fund',
-                        'risk': 'Low',
-                        'expected_return': '9-12% p.a.',
-                        'min_investment': 'Salary-based',
-                        'description': 'Mandatory retirement savings with employer contribution'
-                    },
-                    {
-                        'name': 'Post Office Savings',
-                        'type': 'Savings Account',
-                        'risk': 'Very Low',
-                        'expected_return': '5-7% p.a.',
-                        'min_investment': 'Rs. 500',
-                        'description': 'Easily accessible savings with government guarantee'
-                    }
-                ]
-            },
-            1: {  # Medium income cluster (~82,000 LKR)
-                'segment': 'Balanced Investor',
-                'recommended_savings_rate': '20-30%',
-                'recommendations': [
-                    {
-                        'name': 'Unit Trust Funds',
-                        'type': 'Mutual Fund',
-                        'risk': 'Medium',
-                        'expected_return': '12-15% p.a.',
-                        'min_investment': 'Rs. 5,000',
-                        'description': 'Diversified portfolio managed by professionals'
-                    },
-                    {
-                        'name': 'Corporate Debentures',
-                        'type': 'Fixed Income',
-                        'risk': 'Medium-Low',
-                        'expected_return': '10-13% p.a.',
-                        'min_investment': 'Rs. 25,000',
-                        'description': 'Higher returns than FDs with moderate risk'
-                    },
-                    {
-                        'name': 'Treasury Bonds',
-                        'type': 'Government Securities',
-                        'risk': 'Low',
-                        'expected_return': '11-14% p.a.',
-                        'min_investment': 'Rs. 10,000',
-                        'description': 'Government-backed securities with steady returns'
-                    },
-                    {
-                        'name': 'Gold Investment (ETF/Physical)',
-                        'type': 'Commodity',
-                        'risk': 'Medium',
-                        'expected_return': '8-12% p.a.',
-                        'min_investment': 'Rs. 10,000',
-                        'description': 'Hedge against inflation and currency fluctuation'
-                    }
-                ]
-            },
-            2: {  # High income cluster (~129,000 LKR)
-                'segment': 'Growth Investor',
-                'recommended_savings_rate': '30-40%',
-                'recommendations': [
-                    {
-                        'name': 'Colombo Stock Exchange (CSE) Stocks',
-                        'type': 'Equity',
-                        'risk': 'High',
-                        'expected_return': '15-25% p.a.',
-                        'min_investment': 'Rs. 50,000',
-                        'description': 'Direct stock investment for long-term wealth growth'
-                    },
-                    {
-                        'name': 'Real Estate Investment',
-                        'type': 'Property',
-                        'risk': 'Medium-High',
-                        'expected_return': '10-20% p.a.',
-                        'min_investment': 'Rs. 500,000',
-                        'description': 'Land or property investment for capital appreciation'
-                    },
-                    {
-                        'name': 'Equity Mutual Funds',
-                        'type': 'Mutual Fund',
-                        'risk': 'High',
-                        'expected_return': '15-20% p.a.',
-                        'min_investment': 'Rs. 25,000',
-                        'description': 'Professionally managed stock portfolio'
-                    },
-                    {
-                        'name': 'Dollar-Denominated Investments',
-                        'type': 'Foreign Currency',
-                        'risk': 'Medium-High',
-                        'expected_return': '5-8% + FX gains',
-                        'min_investment': '$500',
-                        'description': 'Protect against LKR depreciation'
-                    },
-                    {
-                        'name': 'Business/Startup Investment',
-                        'type': 'Entrepreneurship',
-                        'risk': 'Very High',
-                        'expected_return': '20-50%+ p.a.',
-                        'min_investment': 'Rs. 100,000+',
-                        'description': 'High-risk, high-reward business opportunities'
-                    }
-                ]
-            }
-        }
+        cluster = registry.get('investment_segmenter').assign(features)[0]
         
-        # Adjust recommendations based on risk tolerance
-        base_recommendations = investment_plans.get(cluster, investment_plans[1])
-        filtered_recommendations = []
-        
-        for rec in base_recommendations['recommendations']:
-            risk_level = rec['risk'].lower()
-            if risk_tolerance == 'conservative':
-                if 'low' in risk_level or 'very low' in risk_level:
-                    filtered_recommendations.append(rec)
-            elif risk_tolerance == 'moderate':
-                if 'high' not in risk_level or 'medium' in risk_level:
-                    filtered_recommendations.append(rec)
-            else:  # aggressive
-                filtered_recommendations.append(rec)
-        
-        # If too few recommendations after filtering, add some back
-        if len(filtered_recommendations) < 2:
-            filtered_recommendations = base_recommendations['recommendations'][:3]
+        # Segment, filtered options and advice come pre-serialized from the content catalog
+        catalog = registry.get('content_catalog')
+        fragments = catalog.investment_fragments(cluster, risk_tolerance, investment_duration, investment_goal)
         
         # Calculate suggested monthly investment
-        if risk_tolerance == 'conservative':
-            savings_rate = 0.15
-        elif risk_tolerance == 'moderate':
-            savings_rate = 0.25
-        else:
-            savings_rate = 0.35
+        suggested_monthly = int(monthly_income * catalog.savings_rate(risk_tolerance))
         
-        suggested_monthly = int(monthly_income * savings_rate)
-        
-        # Investment duration tips
-        duration_tips = {
-            'short': 'Focus on liquid investments like Fixed Deposits and Treasury Bills that can be easily accessed within 1-3 years.',
-            'medium': 'Balance between growth and security. Consider a mix of Unit Trusts and Corporate Debentures for 3-7 year goals.',
-            'long': 'Maximize growth potential with equity investments and real estate. Time in market reduces volatility risk over 7+ years.'
-        }
-        
-        # Goal-specific advice
-        goal_advice = {
-            'retirement': 'Prioritize EPF/ETF contributions and long-term equity investments. Consider pension plans for tax benefits.',
-            'wealth-growth': 'Diversify across asset classes. Reinvest dividends and compound your returns over time.',
-            'education': 'Start a dedicated education fund early. Consider child education insurance plans with guaranteed returns.',
-            'home-purchase': 'Build a down payment fund in safe instruments. Aim for 20% of property value to avoid high interest.',
-            'emergency-fund': 'Keep 6 months of expenses in easily accessible savings. NSB or high-yield savings accounts are ideal.',
-            'passive-income': 'Focus on dividend-paying stocks, rental properties, and fixed income securities for regular income.',
-            'business': 'Build capital gradually. Consider business loans with your savings as collateral for leverage.'
-        }
-        
-        return jsonify({
-            'success': True,
-            'recommendations': {
-                'segment': base_recommendations['segment'],
-                'cluster': int(cluster),
-                'monthly_income': monthly_income,
-                'suggested_monthly_investment': suggested_monthly,
-                'recommended_savings_rate': base_recommendations['recommended_savings_rate'],
-                'investment_options': filtered_recommendations,
-                'duration_tip': duration_tips.get(investment_duration, duration_tips['medium']),
-                'goal_advice': goal_advice.get(investment_goal, goal_advice['wealth-growth']),
-                'risk_profile': risk_tolerance.capitalize(),
-                'current_savings': savings
-            }
+        recommendations = object_bytes(fragments, {
+            'cluster': cluster,
+            'monthly_income': monthly_income,
+            'suggested_monthly_investment': suggested_monthly,
+            'risk_profile': risk_tolerance.capitalize(),
+            'current_savings': savings
         })
+        return json_response(success_bytes('recommendations', recommendations))
         
     except Exception as e:
-        print(f"Investment recommendation error: {e}")
+        log.exception("Investment recommendation failed", error=str(e))
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+def create_app():
+    """
+    Build the Flask application. Models and reference tables are loaded once when this
+    module is imported, so a preloading server shares them across all worker processes.
+    """
+    flask_app = Flask(__name__)
+    flask_app.json = FastJSONProvider(flask_app)  # orjson when installed; NumPy values serialize as-is
+    CORS(flask_app)  # Enable CORS for React frontend
+    flask_app.register_blueprint(api)
+    return flask_app
+
+if ARTIFACT_LOADING != 'lazy':
+    registry.preload()
+
+if MODEL_WATCH_INTERVAL > 0:
+    registry.watch([MODELS_PATH, KMEANS_PATH, mmap_path_for(KMEANS_PATH), os.path.join(BACKEND_PATH, '1.pkl')],
+                   MODEL_WATCH_INTERVAL)
+
+app = create_app()
+
 if __name__ == '__main__':
-    print("=" * 50)
-    print("Healthcare Recommender System Backend")
-    print("=" * 50)
-    print(f"Model loaded: RandomForestClassifier")
-    print(f"Model features: {model.feature_names_in_}")
-    print(f"Welfare classes: {encoders['welfare'].classes_}")
-    print(f"Doctors database: {len(doctors_df)} specialists")
-    print(f"Hospitals database: {len(hospitals_df)} hospitals")
-    print("Chatbot: Enabled (English & Sinhala)")
-    print("=" * 50)
+    registry.load_all()
+    log.info(
+        "Healthcare Recommender System Backend",
+        model='RandomForestClassifier',
+        inferenceEngine=type(registry.get('scoring_model')).__name__,
+        mmapArtifacts=MMAP_ARTIFACTS,
+        tableCache=TABLE_CACHE,
+        welfareClasses=list(registry.get('encoders')['welfare'].classes_),
+        doctors=len(registry.get('specialist_index').doctors_df),
+        hospitals=len(registry.get('hospitals_df')),
+        chatbot='English & Sinhala',
+        artifacts=registry.report()
+    )
     app.run(debug=False, port=5000, host='0.0.0.0')
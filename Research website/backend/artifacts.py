@@ -0,0 +1,70 @@
+"""
+Memory-mapped artifact format.
+
+Artifacts are written with joblib uncompressed, so their NumPy arrays are stored raw
+and can be opened with ``mmap_mode='r'``: every worker process maps the same file and
+the arrays live once in the OS page cache instead of once per worker.
+
+scikit-learn trees copy their node arrays into private memory when unpickled, so the
+welfare forest is stored in its flattened ForestEngine form, whose arrays map directly.
+"""
+import logging
+import os
+
+from file_utils import file_digest, write_atomic
+
+log = logging.getLogger(__name__)
+
+MMAP_SUFFIX = '.mmap.joblib'
+
+# Bumped whenever the stored layout changes, so old conversions count as stale
+FORMAT_VERSION = 1
+
+
+def mmap_path_for(source_path):
+    """Path of the memory-mappable version of a .pkl artifact"""
+    return os.path.splitext(source_path)[0] + MMAP_SUFFIX
+
+
+def read_mmap(path):
+    """(format version, source SHA-256, artifact) of a converted file, arrays memory-mapped read-only"""
+    import joblib
+    stored = joblib.load(path, mmap_mode='r')
+    if not isinstance(stored, dict) or 'source_sha256' not in stored:  # Written before the digest was stored
+        return None, None, stored
+    return stored['version'], stored['source_sha256'], stored['artifact']
+
+
+def is_fresh(mmap_path, source_path):
+    """True if the converted artifact exists and was made from the source's current contents.
+
+    Compares the SHA-256 stored at conversion, not modification times, so a retrained
+    model copied in with an older or preserved mtime is never served from a stale copy.
+    """
+    if not os.path.exists(mmap_path):
+        return False
+    try:
+        version, digest, _ = read_mmap(mmap_path)
+    except Exception as e:
+        log.warning("Ignoring unreadable memory-mapped artifact %s: %s", mmap_path, e)
+        return False
+    if version != FORMAT_VERSION or digest != file_digest(source_path):
+        log.warning("Ignoring stale memory-mapped artifact %s (rerun convert_artifacts.py)", mmap_path)
+        return False
+    return True
+
+
+def save_mmap(obj, path, source_path):
+    """Write an artifact with its arrays stored raw (uncompressed) for memory mapping, tagged with its source's SHA-256"""
+    import joblib
+    stored = {'version': FORMAT_VERSION, 'source_sha256': file_digest(source_path), 'artifact': obj}
+    write_atomic(path, lambda f: joblib.dump(stored, f, compress=0))
+
+
+def load_mmap(path, source_path):
+    """Open an artifact with its arrays memory-mapped read-only (raises ValueError if ``source_path`` changed since)"""
+    version, digest, artifact = read_mmap(path)
+    if version != FORMAT_VERSION or digest != file_digest(source_path):
+        raise ValueError(f"{os.path.basename(path)} was not converted from the current "
+                         f"{os.path.basename(source_path)}; rerun convert_artifacts.py")
+    return artifact
@@ -0,0 +1,16 @@
+"""
+ASGI entrypoint for the backend.
+
+Wraps the Flask app for ASGI servers. Flask still runs each request in a worker
+thread; ``async def`` routes such as /api/recommend/async run on an event loop in that
+thread and await their lookups concurrently.
+
+Usage:
+    uvicorn asgi:asgi_app --port 5000
+"""
+from asgiref.wsgi import WsgiToAsgi
+
+from app import app, registry
+
+registry.load_all()
+asgi_app = WsgiToAsgi(app)
@@ -0,0 +1,64 @@
+"""
+Offline eligibility scoring for household record files.
+
+Reads applicant records (CSV with the form field names as columns, or NDJSON) and
+writes one NDJSON result per record, using the same score_applicants service as the API.
+
+Usage:
+    python batch_score.py households.csv > scores.ndjson
+    python batch_score.py households.ndjson -o scores.ndjson
+"""
+import argparse
+import csv
+import sys
+
+from app import score_records
+from json_provider import dumps, loads
+
+# Records scored per probability pass
+CHUNK_SIZE = 10000
+
+
+def read_records(path):
+    """Yield applicant records from a CSV or NDJSON file (errors are yielded in place)"""
+    with open(path, encoding='utf-8', newline='') as f:
+        if path.lower().endswith('.csv'):
+            # Empty cells fall back to the form defaults, like missing JSON fields
+            for row in csv.DictReader(f):
+                yield {field: value for field, value in row.items() if value not in ('', None)}
+            return
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield loads(line)
+            except ValueError as e:
+                yield ValueError(f'Invalid JSON line: {e}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Score applicant records for welfare eligibility')
+    parser.add_argument('input', help='CSV or NDJSON file of applicant records')
+    parser.add_argument('-o', '--output', help='Output NDJSON file (default: stdout)')
+    args = parser.parse_args()
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        chunk = []
+        start = 0
+        for record in read_records(args.input):
+            chunk.append(record)
+            if len(chunk) == CHUNK_SIZE:
+                for result in score_records(chunk, start):
+                    out.write(dumps(result) + '\n')
+                start += len(chunk)
+                chunk = []
+        for result in score_records(chunk, start):
+            out.write(dumps(result) + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Serialization cost per endpoint: Flask's default provider vs the stdlib and orjson
+paths of json_provider.
+
+Builds a representative response body for each endpoint (with the NumPy values the
+routes now return as-is) and times encoding it to bytes.
+
+Usage:
+    python bench_json.py --batch-size 1000 --repeat 200
+"""
+import argparse
+import json
+import random
+import timeit
+
+from flask.json.provider import DefaultJSONProvider
+
+import app
+import json_provider
+
+
+def sample_payloads(batch_size):
+    client = app.app.test_client()
+    applicant = {
+        'age': 45, 'gender': 'female', 'familySize': 5, 'district': 'kandy',
+        'monthlyIncome': 'below-25000', 'educationLevel': 'olevel', 'employmentStatus': 'unemployed',
+        'medicalCondition': 'diabetes', 'symptoms': 'fatigue', 'symptomsDescription': 'frequent thirst'
+    }
+    recommend = client.post('/api/recommend', json=applicant).get_json()
+    score = app.score_applicants(app.encode_applicants([app.parse_applicant(applicant)]))[0]
+    recommend['recommendations']['confidence'] = score['confidence']
+
+    rng = random.Random(0)
+    records = [
+        dict(applicant, age=rng.randint(18, 90), familySize=rng.randint(1, 10),
+             monthlyIncome=rng.choice(list(app.INCOME_MAPPING)))
+        for _ in range(batch_size)
+    ]
+    results = app.score_records(records)
+    batch = {'success': True, 'count': len(results), 'errors': 0, 'results': results}
+
+    longest = max(app.knowledge_base_en, key=lambda topic: len(app.knowledge_base_en[topic]))
+    chat = {'success': True, 'response': app.knowledge_base_en[longest], 'language': 'en'}
+
+    investment = client.post('/api/investment-recommend', json={'age': 30, 'monthlyIncome': 60000}).get_json()
+    investment['recommendations']['cluster'] = app.registry.get('investment_kmeans').predict([[60000, 30, 0.5]])[0]
+
+    return {
+        '/api/recommend': recommend,
+        f'/api/recommend/batch ({batch_size})': batch,
+        '/api/chat': chat,
+        '/api/investment-recommend': investment,
+        '/api/artifacts': {'success': True, 'artifacts': app.registry.report()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON encoding of API responses')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Applicants in the batch response')
+    parser.add_argument('--repeat', type=int, default=200, help='Encodings per measurement')
+    args = parser.parse_args()
+
+    flask_default = DefaultJSONProvider(app.app)
+    encoders = [
+        # Flask's provider cannot encode NumPy values, so it gets a plain-Python copy
+        ('flask default', lambda obj: flask_default.dumps(obj).encode('utf-8'), True),
+        ('stdlib', lambda obj: json_provider.stdlib_dumps_bytes(obj, sort_keys=True), False),
+    ]
+    if json_provider.orjson is not None:
+        encoders.append(('orjson', lambda obj: json_provider.orjson_dumps_bytes(obj, sort_keys=True), False))
+
+    print(f"Active encoder: {json_provider.ENCODER}")
+    print(f"{'Endpoint':<32} {'Size':>9} " + ' '.join(f'{name:>14}' for name, _, _ in encoders))
+    for endpoint, payload in sample_payloads(args.batch_size).items():
+        plain = json.loads(json_provider.stdlib_dumps_bytes(payload))
+        size = len(json_provider.stdlib_dumps_bytes(payload))
+        timings = []
+        for name, encode, needs_plain in encoders:
+            obj = plain if needs_plain else payload
+            seconds = min(timeit.repeat(lambda: encode(obj), number=args.repeat, repeat=3)) / args.repeat
+            timings.append(f'{seconds * 1e6:>11.1f} us')
+        print(f"{endpoint:<32} {size / 1024:>6.1f} KB " + ' '.join(timings))
+
+
+if __name__ == '__main__':
+    main()
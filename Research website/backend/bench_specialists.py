@@ -0,0 +1,94 @@
+"""
+Specialist search latency: the substring-count loop vs the BM25 index.
+
+Grows the doctor list into a synthetic registry (rows recombine the real
+``Diseases_Treated`` phrases with generated rare conditions), then times both
+searches on the same queries and prints median and 99th percentile latencies.
+
+Usage:
+    python bench_specialists.py --rows 100000 --queries 200
+"""
+import argparse
+import os
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from bm25 import BM25Index
+
+BACKEND_PATH = os.path.dirname(os.path.abspath(__file__))
+DOCTORS_CSV = os.path.join(BACKEND_PATH, 'models', 'All_Doctor list.csv')
+
+QUERIES = [
+    'diabetes fatigue frequent thirst',
+    'heart disease chest pain',
+    'skin rash itchy',
+    'asthma breathing difficulty',
+    'back pain after injury',
+    'anxiety depression insomnia',
+    'fever cough infection',
+    'kidney stones',
+]
+
+
+def synthetic_registry(rows, seed=0):
+    """Diseases_Treated texts for a registry of ``rows`` practitioners"""
+    doctors = pd.read_csv(DOCTORS_CSV, encoding='latin-1')
+    phrases = sorted({phrase.strip() for text in doctors['Diseases_Treated'] for phrase in str(text).split(';')})
+    rng = random.Random(seed)
+    rare = [f'syndrome{n:05d}' for n in range(rows // 10)]
+    return [
+        '; '.join(rng.sample(phrases, rng.randint(2, 6)) + [rng.choice(rare)])
+        for _ in range(rows)
+    ]
+
+
+def substring_loop(texts, query, limit=5):
+    """Score every row by the number of query terms found in its text, best first"""
+    terms = [term for term in query.lower().split() if len(term) > 2]
+    scores = {}
+    for row, text in enumerate(texts):
+        hits = sum(1 for term in terms if term in text)
+        if hits:
+            scores[row] = hits
+    return sorted(scores, key=lambda row: (-scores[row], row))[:limit]
+
+
+def percentiles(timings):
+    timings = np.array(timings) * 1e6
+    return np.percentile(timings, 50), np.percentile(timings, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark specialist search')
+    parser.add_argument('--rows', type=int, default=100000, help='Practitioners in the synthetic registry')
+    parser.add_argument('--queries', type=int, default=200, help='Searches timed per method')
+    args = parser.parse_args()
+
+    texts = synthetic_registry(args.rows)
+    lowered = [text.lower() for text in texts]
+
+    start = time.perf_counter()
+    index = BM25Index(texts)
+    print(f"{args.rows} rows, {len(index.vocabulary)} terms; BM25 index built in {time.perf_counter() - start:.2f} s")
+
+    queries = [QUERIES[i % len(QUERIES)] for i in range(args.queries)]
+    methods = [
+        ('substring loop', lambda query: substring_loop(lowered, query)),
+        ('bm25 index', lambda query: index.search(query)),
+    ]
+    print(f"{'Method':<16} {'p50':>12} {'p99':>12}")
+    for name, search in methods:
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            search(query)
+            timings.append(time.perf_counter() - start)
+        p50, p99 = percentiles(timings)
+        print(f"{name:<16} {p50:>9.1f} us {p99:>9.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+import re
+
+import numpy as np
+
+TOKEN = re.compile(r'[a-z0-9]+')
+
+# Ranking parameters: term frequency saturation and document length normalization
+K1 = 1.2
+B = 0.75
+
+# Below this share of the collection, candidate rows are merged sparsely instead of
+# accumulated into a dense score vector
+SPARSE_POSTINGS_RATIO = 1 / 64
+
+# Rows per block when bounding the top-k scores of a dense score vector
+SCORE_BLOCK = 1024
+
+# Function words longer than two characters; dropped from documents and queries alike,
+# so "and" in "blood; and biopsy analysis" never counts as a match
+STOP_WORDS = frozenset({
+    'about', 'after', 'all', 'also', 'and', 'any', 'are', 'been', 'before', 'being', 'but',
+    'can', 'could', 'did', 'does', 'etc', 'for', 'from', 'had', 'has', 'have', 'her', 'his',
+    'how', 'into', 'its', 'may', 'more', 'most', 'much', 'none', 'nor', 'not', 'other',
+    'our', 'some', 'such', 'than', 'that', 'the', 'their', 'them', 'then', 'there', 'these',
+    'they', 'this', 'those', 'very', 'was', 'were', 'what', 'when', 'where', 'which', 'while',
+    'who', 'why', 'will', 'with', 'would', 'you', 'your',
+})
+
+
+def tokenize(text):
+    """Lowercase word terms longer than two characters, minus stop words, with a plural 's' stripped"""
+    terms = []
+    for word in TOKEN.findall(text.lower()):
+        if len(word) > 2 and word not in STOP_WORDS:
+            if len(word) > 4 and word.endswith('s') and not word.endswith('ss'):
+                word = word[:-1]
+            terms.append(word)
+    return terms
+
+
+class BM25Index:
+    """Okapi BM25 retrieval over a list of documents.
+
+    The term x document weight matrix is computed once and stored in CSR form (one
+    posting list of rows and weights per term), so a query is a sum over the posting
+    lists of its terms followed by a top-k selection with ``argpartition``.
+    """
+
+    def __init__(self, documents, k1=K1, b=B):
+        self.vocabulary = {}
+        term_ids = []
+        doc_ids = []
+        frequencies = []
+        lengths = np.zeros(len(documents), dtype=np.float64)
+
+        for doc, text in enumerate(documents):
+            counts = {}
+            for term in tokenize(text):
+                term_id = self.vocabulary.setdefault(term, len(self.vocabulary))
+                counts[term_id] = counts.get(term_id, 0) + 1
+            lengths[doc] = sum(counts.values())
+            term_ids.extend(counts)
+            doc_ids.extend([doc] * len(counts))
+            frequencies.extend(counts.values())
+
+        self.size = len(documents)
+        term_ids = np.array(term_ids, dtype=np.int64)
+        doc_ids = np.array(doc_ids, dtype=np.int32)
+        frequencies = np.array(frequencies, dtype=np.float64)
+
+        document_frequency = np.bincount(term_ids, minlength=len(self.vocabulary))
+        self.idf = np.log1p((self.size - document_frequency + 0.5) / (document_frequency + 0.5))
+        average_length = lengths.mean() if self.size and lengths.any() else 1.0
+        norms = k1 * (1 - b + b * lengths[doc_ids] / average_length)
+        weights = self.idf[term_ids] * frequencies * (k1 + 1) / (frequencies + norms)
+
+        # Stable sort keeps every posting list in row order
+        order = np.argsort(term_ids, kind='stable')
+        self.indptr = np.concatenate(([0], np.cumsum(document_frequency)))
+        self.rows = doc_ids[order]
+        self.weights = weights[order]
+
+    def postings(self, query):
+        """Rows and weights of the query's known terms, one posting list per distinct term"""
+        term_ids = sorted({self.vocabulary[term] for term in tokenize(query) if term in self.vocabulary})
+        if len(term_ids) == 1:
+            start, stop = self.indptr[term_ids[0]], self.indptr[term_ids[0] + 1]
+            return self.rows[start:stop], self.weights[start:stop]
+        slices = [slice(self.indptr[term_id], self.indptr[term_id + 1]) for term_id in term_ids]
+        return (
+            np.concatenate([self.rows[s] for s in slices] or [self.rows[:0]]),
+            np.concatenate([self.weights[s] for s in slices] or [self.weights[:0]])
+        )
+
+    def search(self, query, limit=5):
+        """(rows, scores) of the best ``limit`` matches, best first; ties keep row order"""
+        rows, weights = self.postings(query)
+        if not len(rows):
+            return rows, weights
+
+        if len(rows) < self.size * SPARSE_POSTINGS_RATIO:
+            candidates, inverse = np.unique(rows, return_inverse=True)
+            scores = np.bincount(inverse, weights)
+        else:
+            scores = np.bincount(rows, weights, minlength=self.size)
+            candidates = np.flatnonzero(scores >= score_floor(scores, limit))
+            scores = scores[candidates]
+        return top_k(candidates, scores, limit)
+
+
+def score_floor(scores, limit):
+    """A positive lower bound on the ``limit``-th best score of a dense score vector.
+
+    Each of the ``limit`` best block maxima is a distinct row, so the ``limit``-th best
+    block maximum never exceeds the ``limit``-th best score.
+    """
+    tiny = np.finfo(scores.dtype).tiny
+    blocks = len(scores) // SCORE_BLOCK
+    if blocks < limit:
+        return tiny
+    maxima = scores[:blocks * SCORE_BLOCK].reshape(blocks, SCORE_BLOCK).max(axis=1)
+    return max(np.partition(maxima, blocks - limit)[blocks - limit], tiny)
+
+
+def top_k(candidates, scores, limit):
+    """The ``limit`` best (candidates, scores), best first; ties keep candidate order.
+
+    ``candidates`` must be in ascending row order.
+    """
+    if len(scores) > limit:
+        threshold = scores[np.argpartition(scores, -limit)[-limit]]
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:limit - len(above)]
+        keep = np.concatenate((above, ties))
+        candidates, scores = candidates[keep], scores[keep]
+    order = np.lexsort((candidates, -scores))
+    return candidates[order], scores[order]
@@ -0,0 +1,224 @@
+from collections import Counter, deque
+from difflib import SequenceMatcher
+
+import numpy as np
+
+# Joins the raw and cleaned message so both are scanned in one pass; never part of a keyword
+SCAN_SEPARATOR = '\x00'
+
+
+def similarity_score(str1, str2):
+    """Calculate similarity between two strings"""
+    return SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
+
+
+class AhoCorasick:
+    """Multi-pattern string matcher (Aho-Corasick automaton).
+
+    Patterns are compiled once; ``find`` then reports every pattern occurring in a
+    text in a single left-to-right pass, independent of the number of patterns.
+    """
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+
+        for pattern in patterns:
+            if pattern:
+                self.add(pattern)
+        self.compile()
+
+    def add(self, pattern):
+        state = 0
+        for char in pattern:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+            state = next_state
+        if pattern not in self.output[state]:
+            self.output[state] = self.output[state] + (pattern,)
+
+    def compile(self):
+        """Compute failure links breadth-first and merge outputs along them"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find(self, text):
+        """Return the set of patterns that occur in ``text``"""
+        goto, fail, output = self.goto, self.fail, self.output
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class KeywordMatcher:
+    """Chatbot keyword table compiled for single-pass matching.
+
+    Keeps the scoring of the original category loops: a phrase hit scores
+    ``len(phrase) * 2`` and the word pass scores ``match_count * 3``. Ties go to the
+    category that comes first in the keyword table.
+    """
+
+    def __init__(self, keywords):
+        self.categories = list(keywords)
+
+        # phrase -> earliest category listing it
+        self.phrase_category = {}
+        # word -> {category position: occurrences across that category's phrases}
+        self.word_counts = {}
+
+        for position, (category, words) in enumerate(keywords.items()):
+            for word in words:
+                self.phrase_category.setdefault(word, position)
+                for part in word.split():
+                    counts = self.word_counts.setdefault(part, {})
+                    counts[position] = counts.get(position, 0) + 1
+
+        self.automaton = AhoCorasick(self.phrase_category)
+
+    def phrase_match(self, q, q_clean):
+        """Best exact phrase hit in either form of the message, as (score, category)"""
+        best_position = None
+        best_length = 0
+        for phrase in self.automaton.find(q_clean + SCAN_SEPARATOR + q):
+            position = self.phrase_category[phrase]
+            if len(phrase) > best_length or (len(phrase) == best_length and position < best_position):
+                best_length = len(phrase)
+                best_position = position
+
+        if best_position is None:
+            return 0, None
+        return best_length * 2, self.categories[best_position]
+
+    def word_match(self, q_words):
+        """Best word-by-word hit, as (score, category)"""
+        totals = {}
+        for word in q_words:
+            for position, count in self.word_counts.get(word, {}).items():
+                totals[position] = totals.get(position, 0) + count
+
+        if not totals:
+            return 0, None
+        best_position = min(totals, key=lambda position: (-totals[position], position))
+        return totals[best_position] * 3, self.categories[best_position]
+
+
+class FuzzyMatcher:
+    """Indexed fuzzy lookup of the keyword phrase most similar to a message.
+
+    Returns the same best phrase as scoring every keyword with ``similarity_score``,
+    without running the quadratic ratio on all of them. Phrases are indexed by
+    length and by a character-count matrix, which give upper bounds on the ratio
+    (``2 * shared characters / total length``):
+
+    * only phrases in the length window that can still beat the threshold are considered;
+    * the bounds for that window come from one vectorized ``minimum``/``sum`` over the matrix;
+    * candidates are visited best bound first, and the search stops once no remaining
+      bound can beat the best ratio found.
+    """
+
+    def __init__(self, keywords, threshold=0.5):
+        self.threshold = threshold
+
+        # (phrase, category) in keyword table order
+        entries = []
+        seen = set()
+        for category, words in keywords.items():
+            for word in words:
+                phrase = word.lower()
+                if phrase in seen:
+                    # An earlier category with the same phrase always wins the tie
+                    continue
+                seen.add(phrase)
+                entries.append((phrase, category))
+
+        order = sorted(range(len(entries)), key=lambda position: len(entries[position][0]))
+        self.phrases = [entries[position][0] for position in order]
+        self.categories = [entries[position][1] for position in order]
+        self.positions = np.array(order, dtype=np.int64)
+        self.lengths = np.array([len(phrase) for phrase in self.phrases], dtype=np.int64)
+
+        self.alphabet = {char: column for column, char in enumerate(sorted(set(''.join(self.phrases))))}
+        self.char_counts = np.zeros((len(self.phrases), len(self.alphabet)), dtype=np.int64)
+        for row, phrase in enumerate(self.phrases):
+            for char, count in Counter(phrase).items():
+                self.char_counts[row, self.alphabet[char]] = count
+
+    def window(self, size, threshold):
+        """Row range of phrases whose length-based ratio bound can exceed ``threshold``"""
+        if threshold <= 0:
+            return 0, len(self.phrases)
+        if not size:
+            return 0, 0
+        # 2 * min(a, b) / (a + b) > t  <=>  a * t / (2 - t) < b < a * (2 - t) / t
+        low = size * threshold / (2 - threshold)
+        high = size * (2 - threshold) / threshold
+        return (
+            int(np.searchsorted(self.lengths, low, side='right')),
+            int(np.searchsorted(self.lengths, high, side='left'))
+        )
+
+    def best_match(self, query, threshold=None):
+        """Return (ratio, category) of the most similar phrase with ratio above the threshold.
+
+        Ties go to the phrase listed first. Returns (0, None) if nothing beats the threshold.
+        """
+        if threshold is None:
+            threshold = self.threshold
+        query = query.lower()
+
+        start, stop = self.window(len(query), threshold)
+        if start >= stop:
+            return 0, None
+
+        query_counts = np.zeros(len(self.alphabet), dtype=np.int64)
+        for char, count in Counter(query).items():
+            column = self.alphabet.get(char)
+            if column is not None:
+                query_counts[column] = count
+
+        shared = np.minimum(self.char_counts[start:stop], query_counts).sum(axis=1)
+        bounds = 2.0 * shared / (len(query) + self.lengths[start:stop])
+        rows = np.flatnonzero(bounds > threshold)
+        positions = self.positions[start:stop][rows]
+        rows = rows[np.lexsort((positions, -bounds[rows]))]
+
+        best_ratio = threshold
+        best_position = None
+        best_category = None
+        for row in rows.tolist():
+            bound = float(bounds[row])
+            position = int(self.positions[start + row])
+            if bound < best_ratio:
+                break
+            if bound == best_ratio and position > best_position:
+                # Can at most tie with a phrase listed earlier
+                continue
+            ratio = similarity_score(query, self.phrases[start + row])
+            if ratio > best_ratio or (ratio == best_ratio and best_position is not None and position < best_position):
+                best_ratio = ratio
+                best_position = position
+                best_category = self.categories[start + row]
+
+        if best_category is None:
+            return 0, None
+        return best_ratio, best_category
@@ -0,0 +1,84 @@
+import json
+
+from json_provider import Fragment
+
+RISK_TOLERANCES = ('conservative', 'moderate', 'aggressive')
+
+
+def matches_risk_tolerance(risk, risk_tolerance):
+    """Whether an option with the given risk label suits the applicant's risk tolerance"""
+    risk_level = risk.lower()
+    if risk_tolerance == 'conservative':
+        return 'low' in risk_level or 'very low' in risk_level
+    if risk_tolerance == 'moderate':
+        return 'high' not in risk_level or 'medium' in risk_level
+    return True  # aggressive
+
+
+class ContentCatalog:
+    """Static response content (eligibility outcomes, investment plans and advice).
+
+    Loaded once from a JSON file. Everything a request can select is filtered and
+    serialized up front into immutable Fragments, so routes only serialize their
+    dynamic fields.
+    """
+
+    def __init__(self, path):
+        with open(path, encoding='utf-8') as f:
+            content = json.load(f)
+
+        self.eligibility = {
+            outcome: Fragment(dict(fields, eligibility=outcome))
+            for outcome, fields in content['eligibility'].items()
+        }
+
+        investment = content['investment']
+        plans = {int(cluster): plan for cluster, plan in investment['plans'].items()}
+        self.default_cluster = investment['default_cluster']
+        self.default_risk_tolerance = investment['default_risk_tolerance']
+        self.savings_rates = investment['savings_rates']
+        self.segments = {
+            cluster: {'segment': plan['segment'], 'recommended_savings_rate': plan['recommended_savings_rate']}
+            for cluster, plan in plans.items()
+        }
+
+        # One fragment per (cluster, risk tolerance): segment, savings rate and filtered options
+        self.plans = {}
+        for cluster, plan in plans.items():
+            for risk_tolerance in RISK_TOLERANCES:
+                options = [option for option in plan['recommendations'] if matches_risk_tolerance(option['risk'], risk_tolerance)]
+                # If too few recommendations after filtering, add some back
+                if len(options) < 2:
+                    options = plan['recommendations'][:3]
+                self.plans[cluster, risk_tolerance] = Fragment({
+                    'segment': plan['segment'],
+                    'recommended_savings_rate': plan['recommended_savings_rate'],
+                    'investment_options': options
+                })
+
+        self.duration_tips = {duration: Fragment({'duration_tip': tip}) for duration, tip in investment['duration_tips'].items()}
+        self.default_duration = investment['default_duration']
+        self.goal_advice = {goal: Fragment({'goal_advice': advice}) for goal, advice in investment['goal_advice'].items()}
+        self.default_goal = investment['default_goal']
+
+    def outcome(self, is_eligible):
+        return self.eligibility['Eligible' if is_eligible else 'Not Eligible']
+
+    def investment_fragments(self, cluster, risk_tolerance, duration, goal):
+        """Static fragments of an investment recommendation"""
+        if risk_tolerance not in self.savings_rates:
+            risk_tolerance = self.default_risk_tolerance
+        if (cluster, risk_tolerance) not in self.plans:
+            cluster = self.default_cluster
+        return (
+            self.plans[cluster, risk_tolerance],
+            self.duration_tips.get(duration, self.duration_tips[self.default_duration]),
+            self.goal_advice.get(goal, self.goal_advice[self.default_goal])
+        )
+
+    def segment(self, cluster):
+        """Segment name and recommended savings rate of a cluster"""
+        return self.segments.get(cluster, self.segments[self.default_cluster])
+
+    def savings_rate(self, risk_tolerance):
+        return self.savings_rates.get(risk_tolerance, self.savings_rates[self.default_risk_tolerance])
@@ -0,0 +1,123 @@
+"""
+Convert the welfare forest and investment KMeans to the memory-mapped artifact format.
+
+Writes ``models/welfare_model.mmap.joblib`` (the forest flattened into a ForestEngine)
+and ``2.mmap.joblib`` (the KMeans model) next to their sources. Each records the
+SHA-256 of the .pkl it was made from, and app.py opens it with ``mmap_mode='r'`` only
+while that still matches, so rerun this after replacing either model.
+
+``--measure N`` starts N worker processes per format, each loading the artifacts the
+way a server worker does, and prints their memory before and after loading.
+
+Usage:
+    python convert_artifacts.py
+    python convert_artifacts.py --measure 4
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+
+from artifacts import is_fresh, load_mmap, mmap_path_for, save_mmap
+
+BACKEND_PATH = os.path.dirname(os.path.abspath(__file__))
+WELFARE_MODEL_PATH = os.path.join(BACKEND_PATH, 'models', 'welfare_model.pkl')
+KMEANS_PATH = os.path.join(BACKEND_PATH, '2.pkl')
+
+
+def convert():
+    import joblib
+    from forest_engine import ForestEngine
+
+    conversions = [
+        (WELFARE_MODEL_PATH, lambda path: ForestEngine.from_sklearn(joblib.load(path))),
+        (KMEANS_PATH, joblib.load),
+    ]
+    for source_path, build in conversions:
+        target_path = mmap_path_for(source_path)
+        save_mmap(build(source_path), target_path, source_path)
+        print(f"{os.path.relpath(source_path, BACKEND_PATH)} -> {os.path.relpath(target_path, BACKEND_PATH)} "
+              f"({os.path.getsize(target_path) / 1024:.1f} KB)")
+
+
+def process_memory():
+    """Resident, proportional (shared pages split between processes) and private bytes"""
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            fields = {line.split(':')[0]: int(line.split()[1]) * 1024 for line in f if line.split()[-1] == 'kB'}
+    except OSError:  # Not Linux: only the peak RSS is available
+        from registry import peak_rss_bytes
+        return {'rss': peak_rss_bytes(), 'pss': None, 'private': None}
+    return {
+        'rss': fields['Rss'],
+        'pss': fields['Pss'],
+        'private': fields['Private_Clean'] + fields['Private_Dirty']
+    }
+
+
+def load_artifacts(mode):
+    """Load the forest and KMeans as a server worker would in the given mode"""
+    if mode == 'mmap':
+        return (load_mmap(mmap_path_for(WELFARE_MODEL_PATH), WELFARE_MODEL_PATH),
+                load_mmap(mmap_path_for(KMEANS_PATH), KMEANS_PATH))
+    import joblib
+    from forest_engine import ForestEngine
+    return ForestEngine.from_sklearn(joblib.load(WELFARE_MODEL_PATH)), joblib.load(KMEANS_PATH)
+
+
+def measure_worker(mode, loaded, results):
+    import numpy as np
+    import joblib  # noqa: F401 - imported up front so only the artifacts count as growth
+    import sklearn.ensemble  # noqa: F401
+    import sklearn.cluster  # noqa: F401
+    import warnings
+    warnings.simplefilter('ignore')
+
+    before = process_memory()
+    forest, kmeans = load_artifacts(mode)
+    # Touch every array, as serving traffic eventually does
+    forest.predict_proba(np.zeros((64, forest.feature.max() + 1)))
+    kmeans.predict(kmeans.cluster_centers_)
+    # Measure once every worker has loaded, so shared pages are split between them
+    loaded.wait()
+    results.put((mode, before, process_memory()))
+    loaded.wait()
+
+
+def measure(workers):
+    context = multiprocessing.get_context('spawn')
+    for mode in ('pickle', 'mmap'):
+        loaded = context.Barrier(workers)
+        results = context.Queue()
+        processes = [context.Process(target=measure_worker, args=(mode, loaded, results)) for _ in range(workers)]
+        for process in processes:
+            process.start()
+        rows = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+        print(f"{mode} ({workers} workers)")
+        for key in ('rss', 'pss', 'private'):
+            if rows[0][1][key] is None:
+                continue
+            before = sum(row[1][key] for row in rows) / workers
+            after = sum(row[2][key] for row in rows) / workers
+            print(f"  {key.upper():<8} per worker: {before / 1024 ** 2:7.2f} MB -> {after / 1024 ** 2:7.2f} MB "
+                  f"(+{(after - before) / 1024:.0f} KB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write memory-mappable copies of the model artifacts')
+    parser.add_argument('--measure', type=int, metavar='N',
+                        help='Compare per-worker memory of N processes loading pickles vs memory-mapped artifacts')
+    args = parser.parse_args()
+
+    stale = [path for path in (WELFARE_MODEL_PATH, KMEANS_PATH) if not is_fresh(mmap_path_for(path), path)]
+    if stale or not args.measure:
+        convert()
+    if args.measure:
+        measure(args.measure)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
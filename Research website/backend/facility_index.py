@@ -0,0 +1,72 @@
+import numpy as np
+
+# Mean Earth radius, to turn haversine distances (radians) into kilometres
+EARTH_RADIUS_KM = 6371.0088
+
+
+class FacilityIndex:
+    """k-nearest facility search over latitude/longitude points.
+
+    Facilities at the same coordinates (several hospitals placed at one district
+    centroid, for instance) share one location; the distinct locations go into a
+    haversine BallTree. A query finds the nearest locations of every point in one
+    vectorized call and expands them into facility rows, nearest first, with ties in
+    table order. Distances are only as precise as the coordinates given: facilities
+    placed at a district centroid are all at the same distance.
+    """
+
+    def __init__(self, latitudes, longitudes, rows):
+        from sklearn.neighbors import BallTree
+
+        rows = np.asarray(rows, dtype=np.int64)
+        coordinates = np.radians(np.column_stack((latitudes, longitudes)).astype(np.float64))
+        self.size = len(rows)
+
+        # Locations numbered in order of their first facility, so equal distances break by table order
+        unique, first, inverse = np.unique(coordinates, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        renumber = np.empty(len(unique), dtype=np.int64)
+        renumber[np.argsort(first, kind='stable')] = np.arange(len(unique))
+        locations = renumber[inverse]
+
+        # CSR layout: facility rows of location i are location_rows[indptr[i]:indptr[i + 1]]
+        order = np.argsort(locations, kind='stable')
+        self.location_rows = rows[order]
+        self.location_sizes = np.bincount(locations, minlength=len(unique))
+        self.indptr = np.concatenate(([0], np.cumsum(self.location_sizes)))
+        self.tree = BallTree(unique[np.argsort(renumber)], metric='haversine') if len(unique) else None
+
+    def query(self, points, k):
+        """Nearest ``k`` facilities of every (latitude, longitude) point.
+
+        Returns (rows, distances in km), both of shape (len(points), k); when the index
+        holds fewer than ``k`` facilities the remaining slots are -1 and inf.
+        """
+        points = np.radians(np.asarray(points, dtype=np.float64).reshape(-1, 2))
+        found_rows = np.full((len(points), k), -1, dtype=np.int64)
+        found_distances = np.full((len(points), k), np.inf)
+        if self.tree is None or not len(points) or k <= 0:
+            return found_rows, found_distances
+
+        # k locations always hold at least k facilities
+        per_point = min(k, len(self.location_sizes))
+        distances, locations = self.tree.query(points, k=per_point)
+        order = np.lexsort((locations, distances), axis=-1)
+        distances = np.take_along_axis(distances, order, axis=-1).ravel()
+        locations = np.take_along_axis(locations, order, axis=-1).ravel()
+
+        # Expand every (point, location) pair into that location's facilities
+        counts = self.location_sizes[locations]
+        pair_starts = np.cumsum(counts) - counts
+        offsets = np.arange(counts.sum()) - np.repeat(pair_starts, counts)
+        rows = self.location_rows[np.repeat(self.indptr[locations], counts) + offsets]
+        pair_points = np.repeat(np.arange(len(locations)) // per_point, counts)
+
+        # Keep each point's first k facilities
+        point_counts = np.bincount(pair_points, minlength=len(points))
+        point_starts = np.cumsum(point_counts) - point_counts
+        ranks = np.arange(len(rows)) - point_starts[pair_points]
+        keep = ranks < k
+        found_rows[pair_points[keep], ranks[keep]] = rows[keep]
+        found_distances[pair_points[keep], ranks[keep]] = np.repeat(distances, counts)[keep] * EARTH_RADIUS_KM
+        return found_rows, found_distances
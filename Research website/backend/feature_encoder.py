@@ -0,0 +1,45 @@
+class CodeTable(dict):
+    """Form value → integer code; unknown form values get ``default``"""
+
+    def __init__(self, codes, default):
+        super().__init__(codes)
+        self.default = default
+
+    def __missing__(self, form_value):
+        return self.default
+
+
+class FeatureEncoder:
+    """Fitted LabelEncoders compiled into plain dict lookups.
+
+    ``fields`` maps an encoder name to ``(form_to_encoder, default)``: the form value →
+    encoder value mapping and the encoder value used for unknown form values. Each is
+    composed with the encoder's classes into one form value → integer code table, so
+    encoding a field is a single dict lookup with no scikit-learn validation:
+    ``tables[field][form_value]``.
+    """
+
+    def __init__(self, encoders, fields):
+        self.tables = {}
+        for field, (form_to_encoder, default) in fields.items():
+            class_codes = self.class_codes(encoders[field])
+            unknown = set(form_to_encoder.values()).union([default]) - set(class_codes)
+            if unknown:
+                raise ValueError(f"Encoder '{field}' has no class for {sorted(unknown)}")
+            self.tables[field] = CodeTable(
+                {form: class_codes[value] for form, value in form_to_encoder.items()}, class_codes[default])
+        # Integer code → class name, for decoding predictions
+        self.labels = {field: [str(name) for name in encoder.classes_] for field, encoder in encoders.items()}
+
+    @staticmethod
+    def class_codes(encoder):
+        return {value: code for code, value in enumerate(encoder.classes_.tolist())}
+
+    def encode(self, field, form_value):
+        """Integer code of one form value (unknown values get the field's default)"""
+        return self.tables[field][form_value]
+
+    def decode(self, field, codes):
+        """Class names for integer codes, like LabelEncoder.inverse_transform"""
+        labels = self.labels[field]
+        return [labels[code] for code in codes]
@@ -0,0 +1,44 @@
+"""
+File helpers shared by the derived artifacts (memory-mapped models, table caches).
+
+Both are written next to the file they were made from and identified by that file's
+SHA-256, so a copy that preserves timestamps (``cp -p``, ``rsync -t``, a restore from
+backup) is still recognised as a change.
+"""
+import hashlib
+import os
+import tempfile
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_atomic(path, write):
+    """Call ``write(file)`` on a uniquely named temporary file, then rename it to ``path``.
+
+    Readers never see a partial file, and processes still reading (or mapping) the old
+    file keep its unlinked data. Processes writing the same file at once each use their
+    own temporary file; the last rename wins.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                     delete=False) as f:
+        temp_path = f.name
+        try:
+            write(f)
+        except BaseException:
+            f.close()
+            os.remove(temp_path)
+            raise
+    try:
+        os.replace(temp_path, path)
+    except OSError:
+        os.remove(temp_path)
+        raise
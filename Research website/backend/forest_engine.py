@@ -0,0 +1,98 @@
+import numpy as np
+
+# Upper bound on rows x trees walked at once, to keep the node-index matrix small
+MAX_CELLS_PER_CHUNK = 1000000
+
+
+class ForestEngine:
+    """RandomForestClassifier flattened into NumPy arrays for low-overhead inference.
+
+    All trees are concatenated into one node table (``feature``, ``threshold``,
+    ``left``, ``right``, ``value``) with ``roots`` marking where each tree starts.
+    Leaves point to themselves, so every (row, tree) pair is walked down in
+    lockstep for ``max_depth`` steps with vectorized indexing.
+
+    ``predict_proba`` reproduces scikit-learn's arithmetic exactly: inputs are cast to
+    float32, leaf values are normalized per tree, and tree probabilities are summed
+    in estimator order before dividing by the number of trees.
+    """
+
+    def __init__(self, classes, roots, feature, threshold, left, right, value, max_depth):
+        self.classes_ = classes
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.max_depth = max_depth
+        # Interleaved (left, right) children: child of node n is children[2 * n + went_right]
+        self.children = np.column_stack([left, right]).ravel()
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        """Export a fitted single-output RandomForestClassifier"""
+        if getattr(forest, 'n_outputs_', 1) != 1:
+            raise ValueError('Only single-output forests can be exported')
+
+        n_classes = len(forest.classes_)
+        roots, features, thresholds, lefts, rights, values = [], [], [], [], [], []
+        offset = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+
+            # Same normalization as DecisionTreeClassifier.predict_proba
+            value = tree.value[:, 0, :n_classes].astype(np.float64)
+            normalizer = value.sum(axis=1)
+            normalizer[normalizer == 0.0] = 1.0
+            value = value / normalizer[:, np.newaxis]
+
+            roots.append(offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            values.append(value)
+            offset += tree.node_count
+
+        return cls(
+            classes=np.asarray(forest.classes_),
+            roots=np.asarray(roots, dtype=np.intp),
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            value=np.concatenate(values),
+            max_depth=max(estimator.tree_.max_depth for estimator in forest.estimators_)
+        )
+
+    def apply(self, X):
+        """Leaf node index reached in every tree, shape (n_rows, n_trees)"""
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        # Offsets of each row in the flattened input, so a node test is a single take
+        row_offsets = (np.arange(len(X)) * X.shape[1])[:, np.newaxis]
+        flat_X = X.ravel()
+        nodes = np.repeat(self.roots[np.newaxis, :], len(X), axis=0)
+        for _ in range(self.max_depth):
+            go_right = flat_X.take(row_offsets + self.feature.take(nodes)) > self.threshold.take(nodes)
+            nodes = self.children.take(nodes * 2 + go_right)
+        return nodes
+
+    def predict_proba(self, X):
+        X = np.asarray(X)
+        if X.ndim != 2:
+            raise ValueError('Expected a 2D feature matrix')
+
+        probabilities = np.zeros((len(X), len(self.classes_)))
+        chunk_size = max(1, MAX_CELLS_PER_CHUNK // max(1, len(self.roots)))
+        for start in range(0, len(X), chunk_size):
+            leaves = self.apply(X[start:start + chunk_size])
+            # cumsum adds trees one after another, matching scikit-learn's accumulation order
+            chunk = self.value[leaves].cumsum(axis=1)[:, -1]
+            probabilities[start:start + chunk_size] = chunk / len(self.roots)
+        return probabilities
+
+    def predict(self, X):
+        return self.classes_.take(self.predict_proba(X).argmax(axis=1))
@@ -0,0 +1,149 @@
+import numpy as np
+
+from facility_index import FacilityIndex
+
+GOVERNMENT_LIMIT = 3
+PRIVATE_LIMIT = 2
+ALL_LIMIT = 5
+
+# find_hospitals falls back to districts containing the first characters of the input
+FALLBACK_PREFIX_LENGTH = 4
+
+
+# Facility types the nearest-hospital search can filter on
+HOSPITAL_TYPES = ('Government', 'Private')
+
+
+def normalize_district(district):
+    return district.lower().replace('-', ' ')
+
+
+def serialize_hospital(hospital, hospital_type, is_eligible):
+    """Build the response dict for one hospital"""
+    if is_eligible:
+        note = 'Free/subsidized care available' if hospital_type == 'Government' else 'Paid services'
+    else:
+        note = 'Subsidized rates available' if hospital_type == 'Government' else 'Paid services'
+    return {'name': hospital, 'type': hospital_type, 'note': note}
+
+
+def build_entry(rows):
+    """Pre-serialize the hospitals shown for one lookup key, keeping table order"""
+    government = [row for row in rows if row[1] == 'Government']
+    private = [row for row in rows if row[1] == 'Private']
+    return {
+        'Government': [serialize_hospital(name, kind, True) for name, kind in government[:GOVERNMENT_LIMIT]],
+        'Private': [serialize_hospital(name, kind, True) for name, kind in private[:PRIVATE_LIMIT]],
+        'All': [serialize_hospital(name, kind, False) for name, kind in rows[:ALL_LIMIT]]
+    }
+
+
+class HospitalDirectory:
+    """District-keyed hospital lookup tables and a nearest-hospital index, built once from the hospital list.
+
+    ``districts`` maps a lowercased district name to its pre-serialized hospitals
+    (``Government``/``Private`` lists for eligible users, ``All`` otherwise).
+    ``fallback`` holds the same entries for every substring of up to
+    FALLBACK_PREFIX_LENGTH characters of a district name, so the partial match is
+    a single dict lookup as well.
+
+    Hospitals are positioned by optional ``Latitude``/``Longitude`` columns, or else
+    at their district's centroid, and indexed per type for ``nearest``. The bundled
+    hospital list has no coordinates, so its distances are district-level: every
+    hospital of a district is equally far from any point, and those ties keep table
+    order. Hospitals placed at a centroid are flagged ``approximate``.
+    """
+
+    def __init__(self, hospitals_df, district_centroids=None):
+        rows = list(zip(
+            hospitals_df['Hospital'],
+            hospitals_df['Type'],
+            hospitals_df['District'].str.lower()
+        ))
+
+        district_rows = {}
+        fallback_rows = {}
+        for hospital, hospital_type, district in rows:
+            if not isinstance(district, str):
+                continue
+            district_rows.setdefault(district, []).append((hospital, hospital_type))
+
+            substrings = {
+                district[start:start + length]
+                for length in range(FALLBACK_PREFIX_LENGTH + 1)
+                for start in range(len(district) - length + 1)
+            }
+            for substring in substrings:
+                fallback_rows.setdefault(substring, []).append((hospital, hospital_type))
+
+        self.hospitals_df = hospitals_df
+        self.districts = {district: build_entry(entries) for district, entries in district_rows.items()}
+        self.fallback = {substring: build_entry(entries) for substring, entries in fallback_rows.items()}
+        self.build_spatial_index(hospitals_df, district_centroids)
+
+    def build_spatial_index(self, hospitals_df, district_centroids):
+        """Hospital coordinates and one FacilityIndex per type (plus None for all types)"""
+        self.centroids = {}
+        if district_centroids is not None:
+            for district, latitude, longitude in zip(
+                    district_centroids['District'], district_centroids['Latitude'], district_centroids['Longitude']):
+                self.centroids[normalize_district(district)] = (float(latitude), float(longitude))
+
+        count = len(hospitals_df)
+        latitudes = np.full(count, np.nan)
+        longitudes = np.full(count, np.nan)
+        if 'Latitude' in hospitals_df and 'Longitude' in hospitals_df:
+            latitudes[:] = hospitals_df['Latitude'].to_numpy(dtype=np.float64, na_value=np.nan)
+            longitudes[:] = hospitals_df['Longitude'].to_numpy(dtype=np.float64, na_value=np.nan)
+        approximate = np.zeros(count, dtype=bool)
+        for row, district in enumerate(hospitals_df['District']):
+            if np.isnan(latitudes[row]) or np.isnan(longitudes[row]):
+                centroid = self.centroids.get(normalize_district(district)) if isinstance(district, str) else None
+                if centroid is not None:
+                    latitudes[row], longitudes[row] = centroid
+                    approximate[row] = True
+
+        located = ~(np.isnan(latitudes) | np.isnan(longitudes))
+        types = hospitals_df['Type'].to_numpy()
+        self.hospital_records = [
+            {
+                'name': name,
+                'type': hospital_type,
+                'district': district if isinstance(district, str) else None,
+                'approximate': bool(is_approximate)
+            }
+            for name, hospital_type, district, is_approximate in zip(
+                hospitals_df['Hospital'], types, hospitals_df['District'], approximate)
+        ]
+        self.spatial_indexes = {}
+        for hospital_type in (None,) + HOSPITAL_TYPES:
+            selected = located if hospital_type is None else located & (types == hospital_type)
+            rows = np.flatnonzero(selected)
+            self.spatial_indexes[hospital_type] = FacilityIndex(latitudes[rows], longitudes[rows], rows)
+
+    def lookup(self, district):
+        """Return the pre-serialized hospital entry for a district, or None if nothing matches"""
+        entry = self.districts.get(normalize_district(district))
+        if entry is None:
+            # Try partial match
+            entry = self.fallback.get(district.lower()[:FALLBACK_PREFIX_LENGTH])
+        return entry
+
+    def centroid(self, district):
+        """(latitude, longitude) of a district's centroid, or None if the district is unknown"""
+        return self.centroids.get(normalize_district(district))
+
+    def nearest(self, points, k=5, hospital_type=None):
+        """The ``k`` nearest hospitals of each (latitude, longitude) point, optionally of one type.
+
+        All points are searched in one vectorized query; returns one list of
+        {'name', 'type', 'district', 'approximate', 'distanceKm'} per point, nearest
+        first. ``approximate`` hospitals sit at their district's centroid, so their
+        distanceKm is to the district, not to the hospital.
+        """
+        rows, distances = self.spatial_indexes[hospital_type].query(points, k)
+        records = self.hospital_records
+        return [
+            [dict(records[row], distanceKm=round(distance, 1)) for row, distance in zip(point_rows, point_distances) if row >= 0]
+            for point_rows, point_distances in zip(rows.tolist(), distances.tolist())
+        ]
@@ -0,0 +1,43 @@
+"""
+Validate the reference CSVs and write their columnar caches.
+
+app.py ingests a table on its own the first time it loads it after the CSV changed;
+run this after editing a CSV to catch validation errors and pay the parsing cost
+before deploying. Prints each table's cache size and its parse vs cache load time.
+
+Usage:
+    python ingest_tables.py
+    python ingest_tables.py "models/All_Hospital list.csv"
+"""
+import argparse
+import os
+import time
+
+from table_cache import REFERENCE_TABLES, cache_path_for, file_digest, ingest, read_cache
+
+BACKEND_PATH = os.path.dirname(os.path.abspath(__file__))
+MODELS_PATH = os.path.join(BACKEND_PATH, 'models')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate the reference CSVs and write their columnar caches')
+    parser.add_argument('paths', nargs='*', help='CSV files (default: every reference table in models/)')
+    args = parser.parse_args()
+
+    paths = args.paths or [os.path.join(MODELS_PATH, name) for name in REFERENCE_TABLES]
+    for csv_path in paths:
+        start = time.perf_counter()
+        df = ingest(csv_path, **REFERENCE_TABLES.get(os.path.basename(csv_path), {}))
+        ingested = time.perf_counter() - start
+
+        cache_path = cache_path_for(csv_path)
+        start = time.perf_counter()
+        read_cache(cache_path, file_digest(csv_path))
+        loaded = time.perf_counter() - start
+        print(f"{os.path.basename(csv_path)}: {len(df)} rows -> {os.path.relpath(cache_path, BACKEND_PATH)} "
+              f"({os.path.getsize(cache_path) / 1024:.1f} KB); "
+              f"parse + validate {ingested * 1000:.1f} ms, cache load {loaded * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+JSON encoding for API responses and NDJSON output.
+
+Uses orjson when it is installed (set JSON_ENCODER=stdlib to force the standard
+library) and falls back to ``json`` otherwise. Both paths serialize NumPy scalars and
+arrays directly, so model outputs need no ``int()``/``float()`` casts before jsonify.
+"""
+import json
+import os
+
+import numpy as np
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if os.environ.get('JSON_ENCODER', '').lower() == 'stdlib':
+    orjson = None
+
+ENCODER = 'orjson' if orjson is not None else 'stdlib'
+
+
+def numpy_default(obj):
+    """``default`` hook for types neither encoder handles natively"""
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return DefaultJSONProvider.default(obj)
+
+
+def stdlib_dumps_bytes(obj, sort_keys=False):
+    return json.dumps(obj, default=numpy_default, sort_keys=sort_keys,
+                      ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def orjson_dumps_bytes(obj, sort_keys=False):
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    try:
+        return orjson.dumps(obj, default=numpy_default, option=option)
+    except orjson.JSONEncodeError:
+        # orjson only encodes 64-bit integers; the stdlib encoder has no such limit
+        return stdlib_dumps_bytes(obj, sort_keys)
+
+
+if orjson is not None:
+    dumps_bytes = orjson_dumps_bytes
+    loads = orjson.loads
+else:
+    dumps_bytes = stdlib_dumps_bytes
+    loads = json.loads
+
+
+def dumps(obj, sort_keys=False):
+    """Compact JSON text; NumPy values are encoded as plain numbers and lists"""
+    return dumps_bytes(obj, sort_keys).decode('utf-8')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by ``dumps_bytes``; keys stay sorted like Flask's default"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj, kwargs.get('sort_keys', self.sort_keys))
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj, self.sort_keys), mimetype=self.mimetype)
+
+
+class Fragment:
+    """Members of a JSON object serialized once, to be spliced into response bodies"""
+    __slots__ = ('keys', 'members')
+
+    def __init__(self, obj):
+        self.keys = frozenset(obj)
+        # '{"a":1,"b":2}' -> '"a":1,"b":2'
+        self.members = dumps_bytes(obj, sort_keys=True)[1:-1]
+
+
+def object_bytes(fragments, fields):
+    """
+    JSON object made of pre-serialized fragments plus ``fields`` serialized now.
+    Keys must not repeat across fragments and fields.
+    """
+    parts = [fragment.members for fragment in fragments if fragment.members]
+    if fields:
+        parts.append(dumps_bytes(fields, sort_keys=True)[1:-1])
+    return b'{' + b','.join(parts) + b'}'
+
+
+def success_bytes(key, body):
+    """Response envelope {"<key>": body, "success": true} around an already serialized body"""
+    return b'{"' + key.encode('utf-8') + b'":' + body + b',"success":true}'
+
+
+def json_response(body):
+    """Response for an already serialized JSON body"""
+    return current_app.response_class(body, mimetype=current_app.json.mimetype)
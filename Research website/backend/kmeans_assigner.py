@@ -0,0 +1,33 @@
+import numpy as np
+
+# Rows assigned per distance computation, bounding the (rows x clusters) matrix
+CHUNK_ROWS = 65536
+
+
+class KMeansAssigner:
+    """Nearest-centre assignment for a fitted KMeans without scikit-learn's per-call overhead.
+
+    Uses the same decomposition as scikit-learn: argmin over ||c||^2 - 2 x.c (||x||^2 is
+    the same for every centre), computed as one matrix product per chunk of rows.
+    """
+
+    def __init__(self, cluster_centers):
+        self.cluster_centers = np.ascontiguousarray(cluster_centers, dtype=np.float64)
+        self.center_norms = (self.cluster_centers ** 2).sum(axis=1)
+
+    @classmethod
+    def from_sklearn(cls, kmeans):
+        return cls(kmeans.cluster_centers_)
+
+    def assign(self, X):
+        """Index of the nearest cluster centre for every row of X"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.cluster_centers.shape[1]:
+            raise ValueError(f'Expected rows of {self.cluster_centers.shape[1]} features')
+
+        labels = np.empty(len(X), dtype=np.intp)
+        for start in range(0, len(X), CHUNK_ROWS):
+            chunk = X[start:start + CHUNK_ROWS]
+            distances = self.center_norms - 2.0 * (chunk @ self.cluster_centers.T)
+            labels[start:start + CHUNK_ROWS] = distances.argmin(axis=1)
+        return labels
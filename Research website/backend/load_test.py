@@ -0,0 +1,105 @@
+"""
+Load test for the production server: throughput of /api/recommend and /api/chat
+as the number of gunicorn workers grows.
+
+Starts ``serve.py`` once per worker count, drives it with concurrent HTTP clients
+for a fixed duration and prints requests/second per configuration. Run it on a
+multi-core machine; the clients share the CPU with the server.
+
+Usage:
+    python load_test.py --workers 1 2 4 --clients 16 --duration 10
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+BACKEND_PATH = os.path.dirname(os.path.abspath(__file__))
+
+REQUESTS = [
+    ('/api/recommend', {
+        'age': 45, 'gender': 'female', 'familySize': 5, 'district': 'kandy',
+        'monthlyIncome': 'below-25000', 'educationLevel': 'olevel', 'employmentStatus': 'unemployed',
+        'medicalCondition': 'diabetes', 'symptoms': 'fatigue', 'symptomsDescription': 'frequent thirst'
+    }),
+    ('/api/chat', {'message': 'How do I apply?', 'language': 'en'}),
+]
+
+
+def post(base_url, path, payload):
+    request = urllib.request.Request(
+        base_url + path,
+        data=json.dumps(payload).encode(),
+        headers={'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        response.read()
+
+
+def wait_until_ready(base_url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(base_url + '/api/health', timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('Server did not become ready')
+
+
+def run_load(base_url, path, payload, clients, duration):
+    """Return (requests completed, errors) over ``duration`` seconds"""
+    counts = [0] * clients
+    errors = [0] * clients
+    stop_at = time.monotonic() + duration
+
+    def client(i):
+        while time.monotonic() < stop_at:
+            try:
+                post(base_url, path, payload)
+                counts[i] += 1
+            except OSError:
+                errors[i] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts), sum(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure throughput scaling with worker count')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent client threads')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per measurement')
+    parser.add_argument('--port', type=int, default=5055)
+    args = parser.parse_args()
+
+    base_url = f'http://127.0.0.1:{args.port}'
+    print(f"{'workers':>7} {'endpoint':<22} {'req/s':>9} {'errors':>7}")
+
+    for workers in args.workers:
+        server = subprocess.Popen(
+            [sys.executable, 'serve.py', '--workers', str(workers), '--port', str(args.port), '--host', '127.0.0.1'],
+            cwd=BACKEND_PATH,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_until_ready(base_url)
+            for path, payload in REQUESTS:
+                done, failed = run_load(base_url, path, payload, args.clients, args.duration)
+                print(f"{workers:>7} {path:<22} {done / args.duration:>9.1f} {failed:>7}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
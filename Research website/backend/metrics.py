@@ -0,0 +1,208 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from file_utils import write_atomic
+
+# Upper bounds in seconds, from sub-millisecond lookups to slow model passes
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class NoopSpan:
+    """Stand-in span used while metrics are disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class Span:
+    """Times a ``with`` block and records it in a histogram"""
+    __slots__ = ('histogram', 'label_value', 'start')
+
+    def __init__(self, histogram, label_value):
+        self.histogram = histogram
+        self.label_value = label_value
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(self.label_value, time.perf_counter() - self.start)
+        return False
+
+
+def format_value(value):
+    return '+Inf' if value == float('inf') else repr(float(value))
+
+
+class Histogram:
+    """Latency histogram with one label, rendered in Prometheus text format"""
+
+    def __init__(self, registry, name, documentation, label, buckets=DEFAULT_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value, seconds):
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                # Per-bucket counts (last one is +Inf), then sum
+                series = self._series[label_value] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect_left(self.buckets, seconds)] += 1
+            series[1] += seconds
+        self.registry.changed()
+
+    def time(self, label_value):
+        """Context manager timing one stage; free when metrics are disabled"""
+        if not self.registry.enabled:
+            return NOOP_SPAN
+        return Span(self, label_value)
+
+    def timed(self, label_value):
+        """Decorator timing every call of a function"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.time(label_value):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """{label value: [bucket counts, sum]} observed by this process"""
+        with self._lock:
+            return {label_value: [list(counts), total] for label_value, (counts, total) in self._series.items()}
+
+    def reset(self):
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def render(self, snapshot=None):
+        """Prometheus text lines for this process's series, or for a merged ``snapshot``"""
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        if snapshot is None:
+            snapshot = self.snapshot()
+        series = [(label_value, counts, total) for label_value, (counts, total) in snapshot.items()]
+        for label_value, counts, total in sorted(series):
+            labels = f'{self.label}="{label_value}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels},le="{format_value(bound)}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{labels}}} {format_value(total)}')
+            lines.append(f'{self.name}_count{{{labels}}} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics of this process, or with ``directory`` set, of every process sharing it.
+
+    Without a directory each server worker keeps and exposes its own metrics. With one,
+    every process writes a snapshot of its histograms to ``<directory>/<pid>.json``
+    (from a background thread, at most every ``flush_interval`` seconds, and on exit),
+    and ``render`` sums the snapshots of all of them. Snapshots of exited workers are
+    kept, so totals never go backwards when a worker is replaced; start every server
+    with an empty directory.
+    """
+
+    def __init__(self, enabled=True, directory=None, flush_interval=1.0):
+        self.enabled = enabled
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._metrics = []
+        self._dirty = False
+        self._flusher_pid = None
+        self._flusher_lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            atexit.register(self.flush)
+        if hasattr(os, 'register_at_fork'):
+            # A forked worker starts from zero; what the parent observed stays in the parent's snapshot
+            os.register_at_fork(after_in_child=self._reset_in_child)
+
+    def histogram(self, name, documentation, label, buckets=DEFAULT_BUCKETS):
+        metric = Histogram(self, name, documentation, label, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def changed(self):
+        """Note a new observation; starts this process's flusher thread on first use"""
+        if self.directory is None:
+            return
+        self._dirty = True
+        if self._flusher_pid != os.getpid():
+            with self._flusher_lock:
+                if self._flusher_pid != os.getpid():
+                    self._flusher_pid = os.getpid()
+                    threading.Thread(target=self._flush_loop, name='metrics-flusher', daemon=True).start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            if self._dirty:
+                self.flush()
+
+    def _reset_in_child(self):
+        for metric in self._metrics:
+            metric.reset()
+        self._dirty = False
+        self._flusher_pid = None
+        self._flusher_lock = threading.Lock()
+
+    def flush(self):
+        """Write this process's snapshot to the shared directory"""
+        if self.directory is None:
+            return
+        self._dirty = False
+        snapshot = {metric.name: metric.snapshot() for metric in self._metrics}
+        if not any(snapshot.values()):
+            return
+        path = os.path.join(self.directory, f'{os.getpid()}.json')
+        write_atomic(path, lambda f: f.write(json.dumps(snapshot).encode('utf-8')))
+
+    def collect(self):
+        """{metric name: merged snapshot} summed over every process's snapshot file"""
+        merged = {metric.name: {} for metric in self._metrics}
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), 'rb') as f:
+                    snapshot = json.loads(f.read())
+            except (OSError, ValueError):  # Removed or replaced while listing
+                continue
+            for metric_name, series in snapshot.items():
+                target = merged.get(metric_name)
+                if target is None:
+                    continue
+                for label_value, (counts, total) in series.items():
+                    current = target.setdefault(label_value, [[0] * len(counts), 0.0])
+                    current[0] = [a + b for a, b in zip(current[0], counts)]
+                    current[1] += total
+        return merged
+
+    def render(self):
+        """All metrics in Prometheus text exposition format"""
+        if self.directory is not None:
+            self.flush()
+            merged = self.collect()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render(merged[metric.name] if self.directory is not None else None))
+        return '\n'.join(lines) + '\n'
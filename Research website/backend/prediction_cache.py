@@ -0,0 +1,91 @@
+import numpy as np
+
+from cache import MISSING, LRUCache
+
+# Rows scored per predict_proba call while warming the grid
+WARMUP_CHUNK_SIZE = 50000
+
+
+class PredictionCache:
+    """Memoized class probabilities for encoded eligibility feature rows.
+
+    The feature vector is almost entirely categorical, so identical rows are common.
+    Each distinct row (age, sex, family size, income, education, employment) is scored
+    once and its probability row kept in an LRU memo; the label and confidence follow
+    from its argmax and max.
+
+    ``warm`` pre-scores a whole grid of realistic rows into a dense array, after which
+    any row inside the grid is answered by index arithmetic without touching the model.
+    """
+
+    def __init__(self, model, maxsize=4096):
+        self.model = model
+        self.memo = LRUCache(maxsize=maxsize)
+        self.grid = None
+        self.grid_rows = 0
+
+    def warm(self, ages, sex_codes, family_sizes, incomes, education_codes, employment_codes, model=None):
+        """Score every combination of the given column values and keep the results as a dense grid.
+
+        ``model`` optionally overrides the scorer for this bulk pass.
+        """
+        model = model or self.model
+        axes = [np.asarray(sorted(set(values)), dtype=np.int64) for values in (
+            ages, sex_codes, family_sizes, incomes, education_codes, employment_codes
+        )]
+        mesh = np.meshgrid(*axes, indexing='ij')
+        matrix = np.column_stack([column.ravel() for column in mesh])
+
+        probabilities = np.vstack([
+            model.predict_proba(matrix[start:start + WARMUP_CHUNK_SIZE])
+            for start in range(0, len(matrix), WARMUP_CHUNK_SIZE)
+        ])
+
+        self.grid = (axes, probabilities.reshape([len(axis) for axis in axes] + [probabilities.shape[1]]))
+        self.grid_rows = len(matrix)
+
+    def grid_lookup(self, matrix):
+        """Return (hit mask, grid probabilities for the hit rows)"""
+        axes, table = self.grid
+        hit = np.ones(len(matrix), dtype=bool)
+        positions = []
+        for column, axis in enumerate(axes):
+            values = matrix[:, column]
+            position = np.searchsorted(axis, values).clip(0, len(axis) - 1)
+            hit &= axis[position] == values
+            positions.append(position)
+        return hit, table[tuple(position[hit] for position in positions)]
+
+    def predict_proba(self, matrix):
+        """Class probabilities for each row of an encoded feature matrix, reusing cached rows"""
+        matrix = np.asarray(matrix, dtype=np.int64)
+        probabilities = np.empty((len(matrix), len(self.model.classes_)))
+        pending = np.ones(len(matrix), dtype=bool)
+
+        if self.grid is not None:
+            hit, rows = self.grid_lookup(matrix)
+            probabilities[hit] = rows
+            pending &= ~hit
+
+        misses = {}
+        for i in np.flatnonzero(pending):
+            key = tuple(matrix[i].tolist())
+            cached = self.memo.get(key)
+            if cached is MISSING:
+                misses.setdefault(key, []).append(i)
+            else:
+                probabilities[i] = cached
+
+        if misses:
+            keys = list(misses)
+            scored = self.model.predict_proba(np.array(keys, dtype=np.int64))
+            for key, row in zip(keys, scored):
+                self.memo.set(key, row.copy())
+                probabilities[misses[key]] = row
+
+        return probabilities
+
+    def stats(self):
+        stats = self.memo.stats()
+        stats['gridRows'] = self.grid_rows
+        return stats
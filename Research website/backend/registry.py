@@ -0,0 +1,328 @@
+import contextvars
+import logging
+import os
+import stat
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+log = logging.getLogger(__name__)
+
+
+def estimate_size(obj, seen=None):
+    """Approximate deep memory footprint of a loaded artifact in bytes"""
+    if seen is None:
+        seen = {}
+    if id(obj) in seen:
+        return 0
+    # Keep a reference: __getstate__ builds temporary objects whose ids would otherwise be reused
+    seen[id(obj)] = obj
+
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes + sys.getsizeof(obj) * (obj.base is None)
+    if hasattr(obj, 'memory_usage') and hasattr(obj, 'columns'):  # pandas DataFrame
+        return int(obj.memory_usage(deep=True).sum())
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(key, seen) + estimate_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, seen) for item in obj)
+    elif not isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        try:
+            state = obj.__getstate__()
+        except Exception:
+            state = getattr(obj, '__dict__', None)
+        if isinstance(state, (dict, tuple)):
+            size += estimate_size(state, seen)
+    return size
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, or None where unsupported"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Artifact:
+    def __init__(self, name, loader, depends, preload):
+        self.name = name
+        self.loader = loader
+        self.depends = depends
+        self.preload = preload
+        self.future = None
+        self.seconds = None
+        self.size = None
+
+
+class Generation:
+    """One complete, versioned set of artifacts"""
+
+    def __init__(self, number):
+        self.number = number
+        self.artifacts = {}
+        self.created = time.time()
+
+    def register(self, name, loader, depends=(), preload=True):
+        self.artifacts[name] = Artifact(name, loader, tuple(depends), preload)
+
+    def preloadable(self):
+        return [artifact.name for artifact in self.artifacts.values() if artifact.preload]
+
+
+def fingerprint(paths):
+    """(path, mtime, size) of every file under ``paths``, to detect changes cheaply"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in os.listdir(path))
+        else:
+            files.append(path)
+    state = []
+    for path in sorted(files):
+        try:
+            info = os.stat(path)
+        except OSError:  # Removed while listing
+            continue
+        if stat.S_ISREG(info.st_mode):
+            state.append((path, info.st_mtime_ns, info.st_size))
+    return tuple(state)
+
+
+class ModelRegistry:
+    """Loads named artifacts (models, encoders, tables) on a thread pool, in versioned generations.
+
+    ``configure`` registers the artifacts on a Generation, each with a zero-argument
+    loader, or with ``depends`` to receive other artifacts as arguments. ``get`` returns
+    an artifact, loading it (and its dependencies) on first use; ``preload`` starts
+    loading everything in parallel without blocking. Callers only ever wait for the
+    artifacts they use. Artifacts registered with ``preload=False`` are only ever
+    loaded by ``get``.
+
+    ``reload`` builds the next generation from scratch in the background and swaps it
+    in only once it has loaded completely; if any artifact fails, the current one
+    stays. A request that called ``pin`` keeps reading the generation it started on.
+
+    ``watch`` polls for file changes in the process that calls it only: forked server
+    workers inherit the loaded generation but never poll themselves. Set
+    ``after_watch_reload`` to act on a watcher reload, e.g. to replace the workers, and
+    ``after_api_reload`` to act on a reload a request asked for in one worker.
+    """
+
+    def __init__(self, configure, max_workers=4):
+        self._configure = configure
+        self._max_workers = max_workers
+        self._pinned = contextvars.ContextVar('pinned_generation', default=None)
+        self._generation = self._build(1)
+        self._reloading = None
+        self.last_reload_error = None
+        self._watch = None
+        self.after_watch_reload = None
+        self.after_api_reload = None
+        self._start_threads()
+        if hasattr(os, 'register_at_fork'):
+            # Threads do not survive fork(); forked server workers need their own locks and pool.
+            # The watcher is deliberately not restarted: the parent keeps the only one.
+            os.register_at_fork(before=self._finish_loads_before_fork, after_in_child=self._after_fork_in_child)
+
+    def _start_threads(self):
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='artifact-loader')
+
+    def _in_flight(self):
+        return [
+            artifact
+            for generation in (self._generation, self._reloading) if generation is not None
+            for artifact in generation.artifacts.values()
+            if artifact.future is not None and not artifact.future.done()
+        ]
+
+    def _finish_loads_before_fork(self):
+        """Let running loads finish first: a loader forked mid-import would leave that module locked in the child"""
+        if threading.current_thread().name.startswith('artifact-loader'):
+            return
+        wait([artifact.future for artifact in self._in_flight()])
+
+    def _after_fork_in_child(self):
+        """Fresh threads, and a fresh start for every load the parent's threads had not finished"""
+        self._start_threads()
+        for artifact in self._in_flight():
+            # The parent's loader thread would never complete this future here
+            artifact.future = None
+        # Nothing in this process would finish or swap in the parent's reload
+        self._reloading = None
+
+    def _build(self, number):
+        generation = Generation(number)
+        self._configure(generation)
+        return generation
+
+    @property
+    def generation(self):
+        """The generation this request reads from"""
+        return self._pinned.get() or self._generation
+
+    def pin(self):
+        """Keep reading the current generation in this context until ``unpin``, even across a reload"""
+        self._pinned.set(self._generation)
+
+    def unpin(self):
+        self._pinned.set(None)
+
+    def _load(self, artifact, generation):
+        dependencies = [generation.artifacts[name].future.result() for name in artifact.depends]
+        start = time.perf_counter()
+        value = artifact.loader(*dependencies)
+        artifact.seconds = time.perf_counter() - start
+        artifact.size = estimate_size(value)
+        return value
+
+    def _submit(self, name, generation):
+        """Start loading ``name`` (dependencies first) if it has not been started yet"""
+        artifact = generation.artifacts[name]
+        if artifact.future is None:
+            # Dependencies are always submitted before their dependents, so a loader
+            # waiting on one never blocks the pool
+            for dependency in artifact.depends:
+                self._submit(dependency, generation)
+            artifact.future = self._executor.submit(self._load, artifact, generation)
+        return artifact.future
+
+    def get(self, name):
+        """Return the loaded artifact, waiting for (or triggering) its load"""
+        generation = self.generation
+        artifact = generation.artifacts[name]
+        future = artifact.future
+        if future is None:
+            with self._lock:
+                future = self._submit(name, generation)
+        return future.result()
+
+    def preload(self, names=None, generation=None):
+        """Start loading the given artifacts (default: all preloadable) in the background"""
+        generation = generation or self.generation
+        with self._lock:
+            for name in names or generation.preloadable():
+                self._submit(name, generation)
+
+    def load_all(self, generation=None):
+        """Load every preloadable artifact and wait for all of them"""
+        generation = generation or self.generation
+        self.preload(generation=generation)
+        for name in generation.preloadable():
+            generation.artifacts[name].future.result()
+
+    def reload(self, wait=True, after=None):
+        """Load a new generation and swap it in. Returns its number, or None if one is already loading.
+
+        ``after`` is called (from the reload thread) once the new generation is swapped in.
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return None
+        try:
+            generation = self._build(self._generation.number + 1)
+            self.preload(generation=generation)
+        except Exception:
+            self._reload_lock.release()
+            raise
+        self._reloading = generation
+        thread = threading.Thread(target=self._finish_reload, args=(generation, after), name='artifact-reload', daemon=True)
+        thread.start()
+        if wait:
+            thread.join()
+        return generation.number
+
+    def _finish_reload(self, generation, after=None):
+        try:
+            self.load_all(generation)
+        except Exception as e:
+            self.last_reload_error = f'generation {generation.number}: {e}'
+            log.error("Artifact reload failed, keeping generation %d: %s", self._generation.number, e)
+            after = None
+        else:
+            # A single reference assignment: new requests see the new generation, pinned ones keep theirs
+            self._generation = generation
+            self.last_reload_error = None
+            log.info("Artifacts reloaded: generation %d", generation.number)
+        finally:
+            self._reloading = None
+            self._reload_lock.release()
+        if after is not None:
+            try:
+                after()
+            except Exception as e:
+                log.error("After-reload hook failed: %s", e)
+
+    def watch(self, paths, interval):
+        """Reload whenever a file under ``paths`` changes, checking every ``interval`` seconds"""
+        if self._watch is not None:
+            return
+        self._watch = (tuple(paths), interval)
+        threading.Thread(target=self._watch_loop, args=self._watch, name='artifact-watcher', daemon=True).start()
+
+    def _watch_loop(self, paths, interval):
+        current = fingerprint(paths)
+        while True:
+            time.sleep(interval)
+            changed = fingerprint(paths)
+            if changed == current:
+                continue
+            # Wait for the files to stop changing, so a half-copied file is never loaded
+            time.sleep(interval)
+            if fingerprint(paths) != changed:
+                continue
+            current = changed
+            number = self.reload(wait=True)
+            if number is not None and self._generation.number == number and self.after_watch_reload is not None:
+                self.after_watch_reload()
+
+    def status(self):
+        return {
+            'generation': self._generation.number,
+            'loadedAt': round(self._generation.created, 3),
+            'reloading': None if self._reloading is None else self._reloading.number,
+            'lastReloadError': self.last_reload_error
+        }
+
+    def report(self):
+        """Per-artifact load status, time (seconds) and approximate memory (bytes)"""
+        rows = []
+        for artifact in self.generation.artifacts.values():
+            future = artifact.future
+            if future is None:
+                status = 'not loaded'
+            elif not future.done():
+                status = 'loading'
+            elif future.exception() is not None:
+                status = f'failed: {future.exception()}'
+            else:
+                status = 'loaded'
+            rows.append({
+                'name': artifact.name,
+                'status': status,
+                'seconds': None if artifact.seconds is None else round(artifact.seconds, 4),
+                'bytes': artifact.size
+            })
+        return rows
+
+    def print_report(self):
+        print(f"{'Artifact':<22} {'Status':<12} {'Load time':>10} {'Memory':>10}")
+        for row in self.report():
+            seconds = '-' if row['seconds'] is None else f"{row['seconds'] * 1000:.1f} ms"
+            memory = '-' if row['bytes'] is None else f"{row['bytes'] / 1024:.1f} KB"
+            print(f"{row['name']:<22} {row['status']:<12} {seconds:>10} {memory:>10}")
+        peak = peak_rss_bytes()
+        if peak is not None:
+            print(f"Peak process RSS: {peak / (1024 * 1024):.1f} MB")
@@ -0,0 +1,43 @@
+"""
+Offline investment segmentation for citizen lists.
+
+Reads records with ``age`` and ``monthlyIncome`` (CSV with those columns, or NDJSON)
+and writes one NDJSON result per record: cluster, segment and recommended savings
+rate. Input is processed in fixed-size chunks, each assigned with one vectorized
+distance computation, so memory stays bounded for files of any size.
+
+Usage:
+    python segment_investors.py citizens.csv > segments.ndjson
+    python segment_investors.py citizens.ndjson -o segments.ndjson
+"""
+import argparse
+import sys
+
+from app import iter_chunks, registry, segment_records
+from batch_score import read_records
+from json_provider import dumps_bytes
+
+# Records assigned per vectorized pass
+CHUNK_SIZE = 100000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Assign investment segments to citizen records')
+    parser.add_argument('input', help='CSV or NDJSON file of records with age and monthlyIncome')
+    parser.add_argument('-o', '--output', help='Output NDJSON file (default: stdout)')
+    args = parser.parse_args()
+
+    segmenter = registry.get('investment_segmenter')
+    catalog = registry.get('content_catalog')
+    out = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        for start, chunk in iter_chunks(read_records(args.input), CHUNK_SIZE):
+            results = segment_records(chunk, start, segmenter, catalog)
+            out.write(b''.join(dumps_bytes(result) + b'\n' for result in results))
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
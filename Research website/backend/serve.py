@@ -0,0 +1,143 @@
+"""
+Production server for the backend.
+
+Runs the Flask app under gunicorn with ``preload_app``: the model, encoders, KMeans
+and CSV tables are loaded once in the master process and shared copy-on-write by the
+forked workers. Run ``convert_artifacts.py`` first to memory-map the model arrays, so
+they stay shared even once workers touch them.
+
+Workers share a METRICS_DIR (a fresh temporary directory unless set), so
+``/api/metrics`` reports the totals of all workers whichever one answers.
+
+On platforms without gunicorn (Windows) it falls back to waitress if installed,
+otherwise to the Flask development server.
+
+Usage:
+    python serve.py --workers 4 --port 5000
+"""
+import argparse
+import gc
+import atexit
+import glob
+import importlib.util
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+
+
+def default_workers():
+    return int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+
+
+def freeze_shared_objects(server):
+    """Move everything loaded so far out of the GC's reach so workers don't copy those pages"""
+    gc.collect()
+    gc.freeze()
+
+
+def prepare_metrics_dir():
+    """Point every worker at one empty METRICS_DIR before the app (and its metrics) is imported"""
+    directory = os.environ.get('METRICS_DIR')
+    if directory:
+        # Snapshots from an earlier run would be summed into this one
+        for path in glob.glob(os.path.join(directory, '*.json')):
+            os.remove(path)
+    else:
+        directory = os.environ['METRICS_DIR'] = tempfile.mkdtemp(prefix='welfare-metrics-')
+        master_pid = os.getpid()
+        # Forked workers inherit the exit hook; only the master removes the directory
+        atexit.register(lambda: os.getpid() == master_pid and shutil.rmtree(directory, ignore_errors=True))
+
+
+def restart_workers():
+    """Ask the gunicorn master (this process) to replace its workers gracefully.
+
+    Runs after the master's file watcher swapped in a new artifact generation: the new
+    workers fork from the master and share it, while the old ones finish their requests.
+    """
+    os.kill(os.getpid(), signal.SIGHUP)
+
+
+def reload_through_master():
+    """Ask the gunicorn master (this worker's parent) to load the new generation too and replace its workers.
+
+    Runs in the worker that handled POST /api/admin/reload, once its own reload succeeded;
+    without it, the other workers would keep serving the old generation.
+    """
+    os.kill(os.getppid(), signal.SIGHUP)
+
+
+# Artifact generation the master's current workers were forked with
+workers_generation = None
+
+
+def load_generation_for_new_workers(arbiter):
+    """gunicorn ``on_reload`` hook, run in the master on SIGHUP before it forks the new workers.
+
+    A watcher reload has already swapped in a newer generation; any other SIGHUP (an
+    admin reload in a worker, or an operator) loads one here first.
+    """
+    global workers_generation
+    from app import registry
+
+    if registry.status()['generation'] == workers_generation:
+        registry.reload(wait=True)
+    workers_generation = registry.status()['generation']
+
+
+def serve_gunicorn(flask_app, args):
+    from gunicorn.app.base import BaseApplication
+
+    class PreloadedApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f'{args.host}:{args.port}')
+            self.cfg.set('workers', args.workers)
+            self.cfg.set('threads', args.threads)
+            self.cfg.set('timeout', args.timeout)
+            self.cfg.set('preload_app', True)
+            self.cfg.set('when_ready', freeze_shared_objects)
+            self.cfg.set('on_reload', load_generation_for_new_workers)
+
+        def load(self):
+            return flask_app
+
+    PreloadedApplication().run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the welfare services backend')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 5000)))
+    parser.add_argument('--workers', type=int, default=default_workers(), help='Worker processes')
+    parser.add_argument('--threads', type=int, default=1, help='Threads per worker')
+    parser.add_argument('--timeout', type=int, default=60, help='Worker timeout in seconds')
+    args = parser.parse_args()
+
+    prepare_metrics_dir()
+    # Loads every artifact once, before any worker is forked
+    from app import create_app, registry
+    registry.load_all()
+    registry.print_report()
+    flask_app = create_app()
+
+    if importlib.util.find_spec('gunicorn'):
+        # Only the master runs the MODEL_WATCH_INTERVAL watcher; workers pick up its reloads on restart.
+        # An admin reload in one worker is repeated by the master, which then replaces all workers.
+        global workers_generation
+        workers_generation = registry.status()['generation']
+        registry.after_watch_reload = restart_workers
+        registry.after_api_reload = reload_through_master
+        serve_gunicorn(flask_app, args)
+    elif importlib.util.find_spec('waitress'):
+        from waitress import serve
+        print(f"gunicorn unavailable - serving with waitress ({args.workers * args.threads} threads, one process)")
+        serve(flask_app, host=args.host, port=args.port, threads=args.workers * args.threads)
+    else:
+        print("gunicorn/waitress not installed - falling back to the Flask development server")
+        flask_app.run(debug=False, port=args.port, host=args.host)
+
+
+if __name__ == '__main__':
+    main()
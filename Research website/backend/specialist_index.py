@@ -0,0 +1,61 @@
+import os
+
+from bm25 import BM25Index
+
+
+def file_signature(path):
+    """(mtime_ns, size) of a file, or None if it cannot be read"""
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+
+class SpecialistIndex:
+    """BM25 ranking over the doctor list, built once per artifact generation.
+
+    Each row's ``Diseases_Treated`` text is a document; a search ranks rows by the BM25
+    score of the condition and symptom words, so rare, specific terms ("arrhythmia")
+    outweigh common ones ("disease"). Edits to the CSV are picked up by the registry
+    loading a new generation, never by mutating an index requests are reading;
+    ``changed_signature`` tells the caller when to ask for one.
+    """
+
+    def __init__(self, csv_path, load_table=None):
+        self.csv_path = csv_path
+        # Taken before reading, so an edit made while building is still seen as a change
+        self.signature = file_signature(csv_path)
+        self.reload_requested_for = None
+        if load_table is not None:
+            self.build(load_table(csv_path))
+        else:
+            import pandas as pd
+            self.build(pd.read_csv(csv_path, encoding='latin-1'))
+
+    def build(self, doctors_df):
+        """Build the index from a doctors DataFrame"""
+        entries = [
+            (specialist, treated[:150] + '...' if len(str(treated)) > 150 else treated)
+            for specialist, treated in zip(doctors_df['Specialist'], doctors_df['Diseases_Treated'])
+        ]
+        ranker = BM25Index([str(treated) for treated in doctors_df['Diseases_Treated']])
+
+        self.doctors_df = doctors_df
+        self._index = (entries, ranker)
+
+    def changed_signature(self):
+        """The CSV's (mtime_ns, size) if it changed since this index was built and no reload was asked for it yet"""
+        signature = file_signature(self.csv_path)
+        if signature is None or signature in (self.signature, self.reload_requested_for):
+            return None
+        return signature
+
+    def search(self, search_terms, limit=5):
+        """Best specialists for the search terms, highest BM25 score first"""
+        entries, ranker = self._index
+        rows, scores = ranker.search(search_terms, limit)
+        return [
+            {'specialist': entries[row][0], 'treats': entries[row][1], 'matchScore': round(float(score), 2)}
+            for row, score in zip(rows, scores)
+        ]
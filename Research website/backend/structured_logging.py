@@ -0,0 +1,171 @@
+"""
+Asynchronous structured logging.
+
+Request threads only copy (and redact) a record's fields and put it on a bounded queue;
+a listener thread formats each record as one JSON line and writes it to stderr. Records
+below WARNING can be sampled, and sensitive fields (income, medical details) are
+replaced before they ever leave the request thread.
+
+    log = get_logger('backend')
+    log.info('Recommendation scored', eligibility='Eligible', data=payload)
+"""
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+# Field names whose values are never written to the log, at any nesting depth
+SENSITIVE_FIELDS = frozenset({
+    'monthlyIncome', 'monthly_income', 'income', 'savingsAmount',
+    'medicalCondition', 'medical_condition', 'symptoms', 'symptomsDescription',
+    'features',
+})
+REDACTED = '[redacted]'
+
+# Keyword arguments of Logger methods that are not structured fields
+LOGGING_KWARGS = ('exc_info', 'stack_info', 'stacklevel', 'extra')
+
+
+def redact(value, fields):
+    """Copy of ``value`` with every dict entry named in ``fields`` replaced"""
+    if isinstance(value, dict):
+        return {key: REDACTED if key in fields else redact(item, fields) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(item, fields) for item in value]
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, then the record's fields"""
+
+    def format(self, record):
+        entry = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f'.{int(record.msecs):03d}Z',
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a random ``rate`` fraction of records below WARNING, and every record at or above it"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or self.rate >= 1.0 or random.random() < self.rate
+
+
+class AsyncHandler(QueueHandler):
+    """Redacts a record in the calling thread and hands it to the listener without blocking"""
+
+    def __init__(self, log_queue, redact_fields):
+        super().__init__(log_queue)
+        self.redact_fields = redact_fields
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Other handlers on the root logger receive the same record; change only a copy
+        record = copy.copy(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            record.fields = redact(fields, self.redact_fields)
+        # Resolve the message and traceback now; the listener must not touch live objects
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Never make a request wait on logging
+            self.dropped += 1
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """Logger whose extra keyword arguments become structured fields of the record"""
+
+    def process(self, msg, kwargs):
+        fields = {key: kwargs.pop(key) for key in list(kwargs) if key not in LOGGING_KWARGS}
+        if fields:
+            kwargs['extra'] = {**kwargs.get('extra', {}), 'fields': fields}
+        return msg, kwargs
+
+
+class LoggingPipeline:
+    """The root logger's queue handler and the listener thread draining it.
+
+    The queue handler is added alongside the root logger's existing handlers, so a
+    host's handlers (gunicorn's, pytest's caplog) keep receiving records.
+    """
+
+    def __init__(self, level='INFO', sample_rate=1.0, queue_size=10000, redact_fields=SENSITIVE_FIELDS, stream=None):
+        self.queue_size = queue_size
+        self.output = logging.StreamHandler(stream or sys.stderr)
+        self.output.setFormatter(JsonFormatter())
+        self.handler = AsyncHandler(queue.Queue(queue_size), frozenset(redact_fields))
+        self.handler.addFilter(SamplingFilter(sample_rate))
+
+        root = logging.getLogger()
+        root.addHandler(self.handler)
+        root.setLevel(level)
+        self.listener = None
+        self.start()
+        atexit.register(self.stop)
+        if hasattr(os, 'register_at_fork'):
+            # The listener thread does not survive fork(); forked workers need their own
+            os.register_at_fork(after_in_child=self._restart_in_child)
+
+    def start(self):
+        self.listener = QueueListener(self.handler.queue, self.output, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self):
+        """Flush every queued record and stop the listener"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def close(self):
+        """Stop the listener and detach the queue handler from the root logger"""
+        self.stop()
+        logging.getLogger().removeHandler(self.handler)
+
+    def _restart_in_child(self):
+        if self.handler not in logging.getLogger().handlers:
+            return  # Closed before the fork
+        self.handler.queue = queue.Queue(self.queue_size)
+        self.start()
+
+
+def configure_logging():
+    """Install the pipeline on the root logger from LOG_LEVEL, LOG_SAMPLE_RATE, LOG_QUEUE_SIZE and LOG_REDACT_FIELDS"""
+    extra_fields = [field.strip() for field in os.environ.get('LOG_REDACT_FIELDS', '').split(',') if field.strip()]
+    return LoggingPipeline(
+        level=os.environ.get('LOG_LEVEL', 'INFO').upper(),
+        sample_rate=float(os.environ.get('LOG_SAMPLE_RATE', 1.0)),
+        queue_size=int(os.environ.get('LOG_QUEUE_SIZE', 10000)),
+        redact_fields=SENSITIVE_FIELDS.union(extra_fields)
+    )
+
+
+def get_logger(name):
+    return StructuredLogger(logging.getLogger(name), {})
@@ -0,0 +1,150 @@
+"""
+Columnar binary cache for the reference CSVs.
+
+A CSV is validated and ingested once into ``.cache/<name>.columns.npz`` next to it:
+one NumPy array per column, with low-cardinality text columns (hospital ``Type`` and
+``District``) stored as integer codes plus their categories, and other text columns
+as one UTF-8 buffer with row offsets. The cache records the SHA-256 of the CSV it was
+made from and is reused until the CSV's contents change, so later starts skip CSV
+parsing. It lives in a subdirectory, so writing it does not look like a model change
+to the file watcher.
+"""
+import logging
+import os
+import zipfile
+
+import numpy as np
+
+from file_utils import file_digest, write_atomic
+
+log = logging.getLogger(__name__)
+
+CACHE_DIR = '.cache'
+CACHE_SUFFIX = '.columns.npz'
+
+# Bumped whenever the cache layout changes, so old caches are re-ingested
+FORMAT_VERSION = 1
+
+# Reference tables by file name: required columns, numeric columns (coerced if present)
+# and columns stored as categorical codes
+REFERENCE_TABLES = {
+    'All_Doctor list.csv': {
+        'required': ('Specialist', 'Diseases_Treated'),
+    },
+    'All_Hospital list.csv': {
+        'required': ('Type', 'Hospital', 'District'),
+        'numeric': ('Latitude', 'Longitude'),
+        'categorical': ('Type', 'District'),
+    },
+    'district_centroids.csv': {
+        'required': ('District', 'Latitude', 'Longitude'),
+        'numeric': ('Latitude', 'Longitude'),
+    },
+}
+
+
+def cache_path_for(csv_path):
+    """Path of the columnar cache of a CSV"""
+    directory, name = os.path.split(csv_path)
+    return os.path.join(directory, CACHE_DIR, os.path.splitext(name)[0] + CACHE_SUFFIX)
+
+
+def validate(df, csv_path, required=(), numeric=(), categorical=()):
+    """Check a parsed table against its spec; numeric columns are coerced in place (raises ValueError)"""
+    name = os.path.basename(csv_path)
+    missing = [column for column in required if column not in df.columns]
+    if missing:
+        raise ValueError(f"{name}: missing column(s) {', '.join(missing)}")
+
+    import pandas as pd
+    for column in numeric:
+        if column not in df.columns:
+            continue
+        values = pd.to_numeric(df[column], errors='coerce')
+        bad = np.flatnonzero(values.isna().to_numpy() & df[column].notna().to_numpy())
+        if len(bad):
+            # +2: header line, and 1-based line numbers
+            lines = ', '.join(str(row + 2) for row in bad[:10])
+            raise ValueError(f"{name}: non-numeric {column} on line(s) {lines}")
+        df[column] = values.astype(np.float64)
+
+    for column in categorical:
+        if column in df.columns and df[column].dtype != object:
+            raise ValueError(f"{name}: categorical column {column} must be text")
+    return df
+
+
+def ingest(csv_path, digest=None, required=(), numeric=(), categorical=()):
+    """Parse and validate a CSV, write its columnar cache and return the DataFrame"""
+    import pandas as pd
+
+    df = validate(pd.read_csv(csv_path, encoding='latin-1'), csv_path, required, numeric, categorical)
+    arrays = {
+        'version': np.array(FORMAT_VERSION),
+        'source_sha256': np.array(digest or file_digest(csv_path)),
+        'columns': np.array(list(df.columns), dtype=str),
+    }
+    for i, column in enumerate(df.columns):
+        values = df[column]
+        if column in categorical:
+            codes = values.astype('category').cat
+            arrays[f'{i}_codes'] = codes.codes.to_numpy()
+            arrays[f'{i}_categories'] = np.array(codes.categories, dtype=str)
+        elif values.dtype == object:
+            text = values.fillna('').astype(str).tolist()
+            arrays[f'{i}_missing'] = values.isna().to_numpy()
+            arrays[f'{i}_offsets'] = np.cumsum([0] + [len(value) for value in text], dtype=np.int64)
+            arrays[f'{i}_text'] = np.frombuffer(''.join(text).encode('utf-8'), dtype=np.uint8)
+        else:
+            arrays[f'{i}_values'] = values.to_numpy()
+
+    path = cache_path_for(csv_path)
+    try:
+        write_atomic(path, lambda f: np.savez(f, **arrays))
+    except OSError as e:  # Read-only deployment: serve the parsed table, ingest again next start
+        log.warning("Could not write table cache %s: %s", path, e)
+    return df
+
+
+def read_cache(path, digest):
+    """The cached DataFrame, or None if the cache is missing, outdated or unreadable"""
+    import pandas as pd
+
+    try:
+        with np.load(path, allow_pickle=False) as cache:
+            if int(cache['version']) != FORMAT_VERSION or str(cache['source_sha256']) != digest:
+                return None
+            columns = {}
+            for i, column in enumerate(cache['columns'].tolist()):
+                if f'{i}_codes' in cache:
+                    columns[column] = pd.Categorical.from_codes(cache[f'{i}_codes'], cache[f'{i}_categories'].tolist())
+                elif f'{i}_text' in cache:
+                    buffer = cache[f'{i}_text'].tobytes().decode('utf-8')
+                    offsets = cache[f'{i}_offsets'].tolist()
+                    text = np.empty(len(offsets) - 1, dtype=object)
+                    text[:] = [buffer[start:stop] for start, stop in zip(offsets, offsets[1:])]
+                    text[cache[f'{i}_missing']] = np.nan
+                    columns[column] = text
+                else:
+                    columns[column] = cache[f'{i}_values']
+    except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile) as e:
+        if os.path.exists(path):
+            log.warning("Ignoring unreadable table cache %s: %s", path, e)
+        return None
+    return pd.DataFrame(columns)
+
+
+def load_table(csv_path, use_cache=True):
+    """A reference table as a DataFrame, from its columnar cache when that matches the CSV"""
+    spec = REFERENCE_TABLES.get(os.path.basename(csv_path), {})
+    if not use_cache:
+        import pandas as pd
+        return validate(pd.read_csv(csv_path, encoding='latin-1'), csv_path, **spec)
+
+    digest = file_digest(csv_path)
+    df = read_cache(cache_path_for(csv_path), digest)
+    if df is None:
+        log.info("Ingesting %s into its columnar cache", os.path.basename(csv_path))
+        df = ingest(csv_path, digest, **spec)
+    return df
+
@@ -0,0 +1,19 @@
+import os
+import sys
+
+# The backend modules are imported as top-level modules, as the server runs them
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+@pytest.fixture(scope='session')
+def backend():
+    import app
+    app.registry.load_all()
+    return app
+
+
+@pytest.fixture
+def client(backend):
+    return backend.app.test_client()
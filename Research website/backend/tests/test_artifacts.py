@@ -0,0 +1,42 @@
+"""Memory-mapped artifacts are trusted only while their source's contents match."""
+import os
+
+import joblib
+import numpy as np
+import pytest
+
+from artifacts import is_fresh, load_mmap, mmap_path_for, save_mmap
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'model.pkl'
+    joblib.dump({'weights': np.arange(10.0)}, path)
+    return str(path)
+
+
+def test_round_trip_maps_arrays(source):
+    save_mmap(joblib.load(source), mmap_path_for(source), source)
+
+    assert is_fresh(mmap_path_for(source), source)
+    weights = load_mmap(mmap_path_for(source), source)['weights']
+    assert isinstance(weights, np.memmap) and np.array_equal(weights, np.arange(10.0))
+    assert [name for name in os.listdir(os.path.dirname(source)) if name.endswith('.tmp')] == []
+
+
+def test_replaced_source_with_older_mtime_is_stale(source):
+    save_mmap(joblib.load(source), mmap_path_for(source), source)
+    # A retrained model copied in with its timestamps preserved (cp -p, rsync -t)
+    joblib.dump({'weights': np.arange(10.0) * 2}, source)
+    os.utime(source, (0, 0))
+
+    assert not is_fresh(mmap_path_for(source), source)
+    with pytest.raises(ValueError):
+        load_mmap(mmap_path_for(source), source)
+
+
+def test_unconverted_or_untagged_copies_are_not_fresh(source):
+    assert not is_fresh(mmap_path_for(source), source)
+    # Written before the source digest was stored
+    joblib.dump(joblib.load(source), mmap_path_for(source), compress=0)
+    assert not is_fresh(mmap_path_for(source), source)
@@ -0,0 +1,52 @@
+import json
+
+APPLICANT = {
+    'age': 45, 'gender': 'female', 'familySize': 5, 'district': 'kandy',
+    'monthlyIncome': 'below-25000', 'educationLevel': 'olevel', 'employmentStatus': 'unemployed'
+}
+
+
+def post_batch(client, records):
+    # Sent pre-encoded: the test client's JSON encoder cannot carry ints beyond 64 bits
+    response = client.post('/api/recommend/batch', data=json.dumps(records), content_type='application/json')
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_mixed_batch_reports_invalid_records_individually(client):
+    records = [
+        APPLICANT,
+        dict(APPLICANT, age=10 ** 30),
+        dict(APPLICANT, age=200),
+        dict(APPLICANT, age=-1),
+        dict(APPLICANT, familySize=999999),
+        dict(APPLICANT, gender=5),
+        'not an object',
+        dict(APPLICANT, age='33'),
+    ]
+    body = post_batch(client, records)
+
+    assert body['success'] is True
+    assert body['count'] == len(records)
+    assert body['errors'] == 6
+    results = body['results']
+    assert [result['index'] for result in results] == list(range(len(records)))
+    assert results[1]['error'] == 'age: must be at most 120'
+    assert results[2]['error'] == 'age: must be at most 120'
+    assert results[3]['error'] == 'age: must be at least 0'
+    assert results[4]['error'] == 'familySize: must be at most 50'
+    assert results[5]['error'] == 'gender: must be a string'
+    assert results[6]['error'] == 'Request body must be a JSON object'
+    for result in (results[0], results[7]):
+        assert 'error' not in result
+        assert result['eligibility'] in ('Eligible', 'Not Eligible')
+
+
+def test_batch_scores_match_single_requests(client):
+    records = [APPLICANT, dict(APPLICANT, age=30, monthlyIncome='above-100000', employmentStatus='employed')]
+    results = post_batch(client, records)['results']
+
+    for record, result in zip(records, results):
+        single = client.post('/api/recommend', json=record).get_json()['recommendations']
+        assert result['eligibility'] == single['eligibility']
+        assert result['confidence'] == single['confidence']
@@ -0,0 +1,25 @@
+"""BM25 tokenization and ranking."""
+from bm25 import BM25Index, tokenize
+
+
+def test_tokenize_drops_stop_words_and_short_words():
+    assert tokenize('Fever AND cough, none of the chest pains') == ['fever', 'cough', 'chest', 'pain']
+
+
+def test_function_words_do_not_match_documents():
+    index = BM25Index([
+        'Heart disease; chest pain',
+        'Blood; and biopsy analysis',
+        'Respiratory infection; cough; fever',
+    ])
+    rows, _ = index.search('fever and cough none chest pain')
+    assert sorted(rows.tolist()) == [0, 2]
+    assert 'and' not in index.vocabulary
+
+
+def test_specialist_ranking_ignores_function_words(backend):
+    index = backend.registry.get('specialist_index')
+    with_function_words = index.search('fever and cough none chest pain')
+
+    assert with_function_words == index.search('fever cough chest pain')
+    assert 'Pathologists' not in [row['specialist'] for row in with_function_words]
@@ -0,0 +1,182 @@
+"""Parity of the compiled chatbot matchers with the original linear keyword scan."""
+import random
+import re
+from difflib import SequenceMatcher
+
+import pytest
+
+from chat_matcher import FuzzyMatcher, KeywordMatcher, similarity_score
+
+DEFAULT = 'default'
+
+
+def linear_scan_answer(question, keywords, knowledge_base):
+    """The original find_chatbot_answer: every keyword of every category scanned per question"""
+    q = question.lower().strip()
+    q_clean = re.sub(r'[^\w\s]', '', q)
+
+    best_match = None
+    best_score = 0
+
+    for category, words in keywords.items():
+        for word in words:
+            if word in q_clean or word in q:
+                score = len(word) * 2
+                if score > best_score:
+                    best_score = score
+                    best_match = category
+
+    if best_score < 10:
+        q_words = set(q_clean.split())
+        for category, words in keywords.items():
+            match_count = 0
+            for word in words:
+                for part in word.split():
+                    if part in q_words:
+                        match_count += 1
+            if match_count > 0:
+                score = match_count * 3
+                if score > best_score:
+                    best_score = score
+                    best_match = category
+
+    if best_score < 5:
+        for category, words in keywords.items():
+            for word in words:
+                score = similarity_score(q_clean, word) * 10
+                if score > best_score and score > 5:
+                    best_score = score
+                    best_match = category
+
+    if best_match and best_match in knowledge_base:
+        return knowledge_base[best_match]
+    return DEFAULT
+
+
+def questions_for(keywords, seed=0):
+    """Every keyword alone, recased, punctuated, embedded, paired and mangled, plus noise"""
+    rng = random.Random(seed)
+    phrases = [word for words in keywords.values() for word in words]
+    questions = []
+    for phrase in phrases:
+        questions += [
+            phrase,
+            phrase.upper(),
+            f'  {phrase.title()}?! ',
+            f'Can you tell me about {phrase}, please?',
+            phrase[:-1],
+            phrase[1:] + 'x',
+        ]
+    for _ in range(300):
+        questions.append(' '.join(rng.sample(phrases, 2)))
+        questions.append(''.join(rng.choice('abcdefghij klmnop') for _ in range(rng.randint(0, 25))))
+    return questions
+
+
+@pytest.mark.parametrize('language', ['en', 'si'])
+def test_find_chatbot_answer_matches_linear_scan(backend, language):
+    keywords = backend.keywords_si if language == 'si' else backend.keywords_en
+    knowledge_base = backend.knowledge_base_si if language == 'si' else backend.knowledge_base_en
+
+    for question in questions_for(keywords):
+        expected = linear_scan_answer(question, keywords, knowledge_base)
+        actual = backend.find_chatbot_answer(question, language)
+        if expected == DEFAULT:
+            assert actual not in knowledge_base.values(), question
+        else:
+            assert actual == expected, question
+
+
+OVERLAPPING = {
+    'apply': ['apply', 'how to apply', 'application'],
+    'online': ['apply online', 'online', 'website'],
+    'documents': ['documents', 'application form'],
+    'duplicate': ['apply', 'website'],
+}
+
+
+@pytest.mark.parametrize('question', [
+    'apply',
+    'How do I APPLY online?',
+    'how to apply',
+    'application form please',
+    'website',
+    'online application documents',
+    'Apply! Online!',
+    'documents online apply',
+    'nothing relevant',
+])
+def test_overlapping_keywords_match_linear_scan(question):
+    knowledge_base = {category: category for category in OVERLAPPING}
+    matcher = KeywordMatcher(OVERLAPPING)
+    fuzzy = FuzzyMatcher(OVERLAPPING, 0.5)
+
+    q = question.lower().strip()
+    q_clean = re.sub(r'[^\w\s]', '', q)
+    best_score, best_match = matcher.phrase_match(q, q_clean)
+    if best_score < 10:
+        score, category = matcher.word_match(set(q_clean.split()))
+        if score > best_score:
+            best_score, best_match = score, category
+    if best_score < 5:
+        ratio, category = fuzzy.best_match(q_clean, max(0.5, best_score / 10))
+        if category:
+            best_match = category
+
+    assert (best_match or DEFAULT) == linear_scan_answer(question, OVERLAPPING, knowledge_base)
+
+
+def test_duplicate_phrase_goes_to_first_category():
+    matcher = KeywordMatcher(OVERLAPPING)
+    assert matcher.phrase_match('apply', 'apply') == (10, 'apply')
+    assert matcher.phrase_match('website', 'website') == (14, 'online')
+
+
+def brute_force_best_match(keywords, query, threshold):
+    """Highest SequenceMatcher ratio over every phrase; ties go to the phrase listed first"""
+    best_ratio, best_category = 0, None
+    seen = set()
+    for category, words in keywords.items():
+        for word in words:
+            phrase = word.lower()
+            if phrase in seen:
+                continue
+            seen.add(phrase)
+            ratio = SequenceMatcher(None, query.lower(), phrase).ratio()
+            if ratio > threshold and ratio > best_ratio:
+                best_ratio, best_category = ratio, category
+    return best_ratio, best_category
+
+
+@pytest.mark.parametrize('threshold', [0.0, 0.3, 0.5, 0.8])
+def test_fuzzy_matcher_matches_brute_force(backend, threshold):
+    rng = random.Random(threshold)
+    for keywords in (backend.keywords_en, backend.keywords_si, OVERLAPPING):
+        matcher = FuzzyMatcher(keywords, threshold)
+        phrases = [word for words in keywords.values() for word in words]
+        queries = [''] + [phrase[rng.randint(0, 2):] + rng.choice(['', 's', ' now']) for phrase in phrases]
+        queries += [''.join(rng.choice('aeiouhlpnst ') for _ in range(rng.randint(1, 20))) for _ in range(200)]
+        for query in queries:
+            expected_ratio, expected_category = brute_force_best_match(keywords, query, threshold)
+            ratio, category = matcher.best_match(query)
+            assert category == expected_category, query
+            assert ratio == pytest.approx(expected_ratio), query
+
+
+def test_chat_rejects_oversized_messages(client):
+    assert client.post('/api/chat', json={'message': 'x' * 1001}).status_code == 400
+    assert client.post('/api/chat', data='{"message": "' + 'x' * 10000 + '"}',
+                       content_type='application/json').status_code == 413
+    assert client.post('/api/chat', json={'message': 12}).status_code == 400
+
+
+def test_chat_caches_only_short_messages(backend, client):
+    backend.chat_cache.clear()
+    long_message = 'how do I apply ' + 'please ' * 60
+    assert len(long_message) > backend.CHAT_CACHE_MAX_LENGTH
+
+    for message in ('How do I apply?', long_message):
+        response = client.post('/api/chat', json={'message': message})
+        assert response.status_code == 200
+        assert response.get_json()['response'] == backend.find_chatbot_answer(message, 'en')
+    assert backend.chat_cache.stats()['size'] == 1
@@ -0,0 +1,54 @@
+"""ForestEngine.predict_proba against scikit-learn's RandomForestClassifier."""
+import os
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+
+from forest_engine import ForestEngine
+
+MODELS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+
+
+def test_welfare_model_matches_sklearn():
+    model = joblib.load(os.path.join(MODELS_PATH, 'welfare_model.pkl'))
+    engine = ForestEngine.from_sklearn(model)
+    rng = np.random.default_rng(0)
+    # Realistic ranges per feature, plus values on and around the split thresholds
+    X = rng.uniform(-1, 120, size=(5000, model.n_features_in_))
+    X[:, 1:] = np.round(X[:, 1:] % 15)
+    thresholds = np.concatenate([estimator.tree_.threshold for estimator in model.estimators_])
+    edges = rng.choice(thresholds[thresholds != -2], size=X.shape)
+    X = np.vstack([X, edges, np.nextafter(edges, np.inf)])
+
+    assert np.allclose(engine.predict_proba(X), model.predict_proba(X))
+    assert np.array_equal(engine.predict(X), model.predict(X))
+
+
+@pytest.mark.parametrize('n_classes, max_depth, n_estimators', [(2, None, 25), (3, 4, 10), (5, None, 1)])
+def test_synthetic_forests_match_sklearn(n_classes, max_depth, n_estimators):
+    X, y = make_classification(n_samples=600, n_features=8, n_informative=5, n_classes=n_classes, random_state=n_classes)
+    model = RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=0).fit(X, y)
+    engine = ForestEngine.from_sklearn(model)
+    X_test = np.random.default_rng(1).normal(scale=3, size=(2000, X.shape[1]))
+
+    assert np.allclose(engine.predict_proba(X_test), model.predict_proba(X_test))
+    assert np.array_equal(engine.predict(X_test), model.predict(X_test))
+
+
+def test_chunked_prediction_matches_sklearn(monkeypatch):
+    import forest_engine
+    monkeypatch.setattr(forest_engine, 'MAX_CELLS_PER_CHUNK', 70)
+    X, y = make_classification(n_samples=300, n_features=6, random_state=2)
+    model = RandomForestClassifier(n_estimators=7, random_state=0).fit(X, y)
+
+    assert np.allclose(ForestEngine.from_sklearn(model).predict_proba(X), model.predict_proba(X))
+
+
+def test_multi_output_forest_is_rejected():
+    X, y = make_classification(n_samples=100, n_features=4, random_state=3)
+    model = RandomForestClassifier(n_estimators=2, random_state=0).fit(X, np.column_stack([y, y]))
+    with pytest.raises(ValueError):
+        ForestEngine.from_sklearn(model)
@@ -0,0 +1,23 @@
+import json
+
+import numpy as np
+
+import json_provider
+
+
+def test_numpy_values_encode_as_plain_json():
+    body = json_provider.dumps_bytes({'count': np.int64(3), 'share': np.float32(0.5), 'rows': np.arange(3)})
+    assert json.loads(body) == {'count': 3, 'share': 0.5, 'rows': [0, 1, 2]}
+
+
+def test_integers_beyond_64_bits_fall_back_to_stdlib():
+    assert json.loads(json_provider.dumps_bytes({'amount': 10 ** 30})) == {'amount': 10 ** 30}
+
+
+def test_investment_amounts_are_bounded(client):
+    response = client.post('/api/investment-recommend', json={'age': 30, 'monthlyIncome': 1e30})
+    assert response.status_code == 400
+    assert response.get_json()['errors'][0]['field'] == 'monthlyIncome'
+
+    response = client.post('/api/investment-recommend', json={'age': 30, 'monthlyIncome': 1e12, 'savingsAmount': 1e12})
+    assert response.status_code == 200
@@ -0,0 +1,59 @@
+"""Latency histograms, per process and summed across processes through METRICS_DIR."""
+import os
+
+import pytest
+
+from metrics import MetricsRegistry
+
+
+def sample_count(text, stage):
+    line = next(line for line in text.splitlines() if line.startswith(f'latency_seconds_count{{stage="{stage}"}}'))
+    return int(line.split()[-1])
+
+
+def test_process_local_render():
+    metrics = MetricsRegistry()
+    latency = metrics.histogram('latency_seconds', 'Stage latency', 'stage')
+    latency.observe('predict', 0.002)
+    latency.observe('predict', 0.3)
+
+    text = metrics.render()
+    assert sample_count(text, 'predict') == 2
+    assert 'latency_seconds_bucket{stage="predict",le="0.0025"} 1' in text
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs fork()')
+def test_shared_directory_sums_every_worker(tmp_path):
+    metrics = MetricsRegistry(directory=str(tmp_path), flush_interval=60)
+    latency = metrics.histogram('latency_seconds', 'Stage latency', 'stage')
+
+    workers = []
+    for observations in (3, 5):
+        pid = os.fork()
+        if pid == 0:
+            for _ in range(observations):
+                latency.observe('predict', 0.01)
+            latency.observe('lookup', 0.001)
+            metrics.flush()
+            os._exit(0)
+        workers.append(pid)
+    for pid in workers:
+        os.waitpid(pid, 0)
+
+    # The parent answers the scrape: its own series plus both (exited) workers'
+    latency.observe('predict', 0.01)
+    text = metrics.render()
+    assert sample_count(text, 'predict') == 9
+    assert sample_count(text, 'lookup') == 2
+    assert sorted(os.listdir(tmp_path)) == sorted(f'{pid}.json' for pid in workers + [os.getpid()])
+
+
+def test_flusher_thread_writes_snapshots(tmp_path):
+    import time
+
+    metrics = MetricsRegistry(directory=str(tmp_path), flush_interval=0.05)
+    metrics.histogram('latency_seconds', 'Stage latency', 'stage').observe('predict', 0.01)
+    deadline = time.monotonic() + 5
+    while not os.listdir(tmp_path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert os.listdir(tmp_path) == [f'{os.getpid()}.json']
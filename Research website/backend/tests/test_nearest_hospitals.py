@@ -0,0 +1,39 @@
+"""Nearest-hospital search and its approximate (district-centroid) flag."""
+import pandas as pd
+
+from hospital_directory import HospitalDirectory
+
+CENTROIDS = pd.DataFrame({'District': ['Colombo', 'Kandy'], 'Latitude': [6.93, 7.29], 'Longitude': [79.86, 80.63]})
+
+
+def test_bundled_hospitals_are_flagged_approximate(client):
+    response = client.post('/api/hospitals/nearest', json={'latitude': 6.9, 'longitude': 79.9, 'limit': 5})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['approximate'] is True
+    assert body['hospitals'] and all(hospital['approximate'] for hospital in body['hospitals'])
+    # Hospitals of one district are equidistant; ties come back in table order
+    again = client.post('/api/hospitals/nearest', json={'latitude': 6.9, 'longitude': 79.9, 'limit': 5}).get_json()
+    assert again['hospitals'] == body['hospitals']
+
+
+def test_batch_results_are_flagged_approximate(client):
+    response = client.post('/api/hospitals/nearest/batch?limit=2', json=[{'district': 'Kandy'}, {'latitude': 100}])
+    results = response.get_json()['results']
+    assert results[0]['approximate'] is True
+    assert 'error' in results[1]
+
+
+def test_hospitals_with_coordinates_are_exact():
+    hospitals = pd.DataFrame({
+        'Type': ['Government', 'Private', 'Government'],
+        'Hospital': ['A', 'B', 'C'],
+        'District': ['Colombo', 'Colombo', 'Kandy'],
+        'Latitude': [6.90, None, 7.30],
+        'Longitude': [79.85, None, 80.60]
+    })
+    directory = HospitalDirectory(hospitals, CENTROIDS)
+    found = directory.nearest([(6.90, 79.85)], k=3)[0]
+
+    assert [(hospital['name'], hospital['approximate']) for hospital in found] == [('A', False), ('B', True), ('C', False)]
+    assert found[0]['distanceKm'] == 0.0
@@ -0,0 +1,41 @@
+"""Prediction warmup: the grid is scored up front in both the in-memory and the mmap setup."""
+import numpy as np
+import pytest
+
+from forest_engine import ForestEngine
+from registry import ModelRegistry
+
+
+def check_grid(cache, scoring_model):
+    axes, table = cache.grid
+    rows = np.column_stack([axis[np.arange(50) % len(axis)] for axis in axes])
+    hit, probabilities = cache.grid_lookup(rows)
+    assert hit.all()
+    assert np.allclose(probabilities, scoring_model.predict_proba(rows))
+
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_warmup_grid_matches_serving_engine(backend, monkeypatch, mmap):
+    if mmap and not backend.use_mmap(backend.WELFARE_MODEL_PATH):
+        pytest.skip('no fresh memory-mapped welfare model (run convert_artifacts.py)')
+    monkeypatch.setenv('PREDICTION_WARMUP', '1')
+    monkeypatch.setattr(backend, 'MMAP_ARTIFACTS', mmap)
+    monkeypatch.setattr(backend, 'INFERENCE_ENGINE', 'native')
+    registry = ModelRegistry(backend.register_artifacts)
+
+    # The registration under test: mmap serves the flattened forest and loads scikit-learn lazily
+    assert registry.generation.artifacts['welfare_model'].preload is not mmap
+    scoring_model = registry.get('scoring_model')
+    assert isinstance(scoring_model, ForestEngine)
+    check_grid(registry.get('prediction_cache'), scoring_model)
+
+
+def test_mmap_setup_leaves_scikit_learn_unloaded_without_warmup(backend, monkeypatch):
+    if not backend.use_mmap(backend.WELFARE_MODEL_PATH):
+        pytest.skip('no fresh memory-mapped welfare model (run convert_artifacts.py)')
+    monkeypatch.delenv('PREDICTION_WARMUP', raising=False)
+    monkeypatch.setattr(backend, 'INFERENCE_ENGINE', 'native')
+    registry = ModelRegistry(backend.register_artifacts)
+
+    assert registry.get('prediction_cache').grid is None
+    assert registry.generation.artifacts['welfare_model'].future is None
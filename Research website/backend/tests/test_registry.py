@@ -0,0 +1,180 @@
+import os
+
+import pytest
+
+from registry import ModelRegistry
+from specialist_index import SpecialistIndex
+
+
+@pytest.fixture
+def doctors_csv(tmp_path):
+    path = tmp_path / 'doctors.csv'
+    path.write_text('Specialist,Diseases_Treated\nCardiologists,Heart disease; arrhythmia\n')
+    return path
+
+
+@pytest.fixture
+def registry(doctors_csv):
+    return ModelRegistry(lambda artifacts: artifacts.register('specialist_index', lambda: SpecialistIndex(str(doctors_csv))))
+
+
+def test_reload_swaps_in_edited_table(registry, doctors_csv):
+    old_index = registry.get('specialist_index')
+    doctors_csv.write_text('Specialist,Diseases_Treated\nDermatologists,Skin rash; eczema\n')
+
+    assert registry.reload(wait=True) == 2
+    assert registry.get('specialist_index').search('eczema')[0]['specialist'] == 'Dermatologists'
+    # The old generation's index was not modified in place
+    assert old_index.search('arrhythmia')[0]['specialist'] == 'Cardiologists'
+
+
+def test_failed_reload_keeps_last_good_generation(registry, doctors_csv):
+    registry.get('specialist_index')
+    doctors_csv.write_text('Name,Other\nx,y\n')
+
+    registry.reload(wait=True)
+    assert registry.status()['generation'] == 1
+    assert registry.last_reload_error is not None
+    assert registry.get('specialist_index').search('arrhythmia')[0]['specialist'] == 'Cardiologists'
+
+
+def test_pinned_context_keeps_its_generation(registry, doctors_csv):
+    registry.get('specialist_index')
+    registry.pin()
+    try:
+        doctors_csv.write_text('Specialist,Diseases_Treated\nDermatologists,Skin rash; eczema\n')
+        registry.reload(wait=True)
+        assert registry.get('specialist_index').search('arrhythmia')[0]['specialist'] == 'Cardiologists'
+    finally:
+        registry.unpin()
+    assert registry.get('specialist_index').search('eczema')[0]['specialist'] == 'Dermatologists'
+
+
+def test_admin_reload_requires_matching_token(client, backend, monkeypatch):
+    monkeypatch.setattr(backend, 'ADMIN_TOKEN', 'secret')
+    assert client.post('/api/admin/reload').status_code == 401
+    assert client.post('/api/admin/reload', headers={'X-Admin-Token': 'wrong'}).status_code == 401
+    assert client.post('/api/admin/reload', headers={'X-Admin-Token': 'sécret'}).status_code == 401
+    assert client.post('/api/admin/reload?wait=1', headers={'X-Admin-Token': 'secret'}).status_code == 200
+
+
+def test_admin_reload_runs_the_api_reload_hook_on_success(client, backend, monkeypatch):
+    calls = []
+    monkeypatch.setattr(backend, 'ADMIN_TOKEN', 'secret')
+    monkeypatch.setattr(backend.registry, 'after_api_reload', lambda: calls.append(backend.registry.status()['generation']))
+    response = client.post('/api/admin/reload?wait=1', headers={'X-Admin-Token': 'secret'})
+
+    assert response.status_code == 200
+    assert calls == [response.get_json()['generation']]
+
+
+def test_failed_reload_skips_the_after_hook(registry, doctors_csv):
+    calls = []
+    registry.get('specialist_index')
+    doctors_csv.write_text('Name,Other\nx,y\n')
+    registry.reload(wait=True, after=lambda: calls.append('reloaded'))
+    assert calls == []
+    doctors_csv.write_text('Specialist,Diseases_Treated\nDermatologists,Skin rash; eczema\n')
+    registry.reload(wait=True, after=lambda: calls.append('reloaded'))
+    assert calls == ['reloaded']
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs fork()')
+def test_forked_children_do_not_start_a_watcher(registry, tmp_path):
+    import threading
+
+    registry.watch([str(tmp_path)], 60)
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        watchers = sum(thread.name == 'artifact-watcher' for thread in threading.enumerate())
+        os.write(write_end, str(watchers).encode())
+        os._exit(0)
+    os.waitpid(pid, 0)
+    assert os.read(read_end, 16) == b'0'
+    assert any(thread.name == 'artifact-watcher' for thread in threading.enumerate())
+
+
+def test_forked_children_load_artifacts_left_pending_by_the_parent():
+    import signal
+    import time
+
+    def slow_value():
+        time.sleep(0.5)
+        return 42
+
+    registry = ModelRegistry(lambda artifacts: (
+        artifacts.register('slow', slow_value),
+        artifacts.register('doubled', lambda value: value * 2, depends=['slow'])
+    ))
+    registry.preload()
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        signal.alarm(10)
+        os.write(write_end, str(registry.get('doubled')).encode())
+        os._exit(0)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert os.read(read_end, 16) == b'84'
+    assert registry.get('doubled') == 84
+
+
+def test_after_fork_hook_clears_unfinished_loads():
+    import threading
+
+    release = threading.Event()
+    registry = ModelRegistry(lambda artifacts: (
+        artifacts.register('blocked', lambda: release.wait() and 'parent'),
+        artifacts.register('ready', lambda: 'ready')
+    ))
+    registry.get('ready')
+    registry.preload(['blocked'])
+    stale = registry.generation.artifacts['blocked'].future
+
+    # What os.fork() runs in the child: the stale future is dropped and the child loads its own
+    registry._after_fork_in_child()
+    assert registry.generation.artifacts['blocked'].future is None
+    assert registry.generation.artifacts['ready'].future.done()
+    release.set()
+    assert stale.result() == 'parent'
+    assert registry.get('blocked') == 'parent'
+
+
+def wait_for_reload(registry):
+    import time
+
+    deadline = time.monotonic() + 10
+    while registry.status()['reloading'] is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_search_reloads_an_edited_doctor_list(backend, registry, doctors_csv, monkeypatch):
+    monkeypatch.setattr(backend, 'registry', registry)
+    assert backend.find_specialists('arrhythmia', '')[0]['specialist'] == 'Cardiologists'
+
+    doctors_csv.write_text('Specialist,Diseases_Treated\nDermatologists,Skin rash; eczema; psoriasis\n')
+    backend.find_specialists('eczema', '')
+    wait_for_reload(registry)
+    assert registry.status()['generation'] == 2
+    assert backend.find_specialists('eczema', '')[0]['specialist'] == 'Dermatologists'
+
+
+def test_failed_doctor_list_reload_is_not_retried_until_the_next_edit(backend, registry, doctors_csv, monkeypatch):
+    monkeypatch.setattr(backend, 'registry', registry)
+    backend.find_specialists('arrhythmia', '')
+    reloads = []
+    reload = registry.reload
+    monkeypatch.setattr(registry, 'reload', lambda **kwargs: reloads.append(1) or reload(**kwargs))
+
+    doctors_csv.write_text('Name,Other\nx,y\n')
+    for _ in range(3):
+        backend.find_specialists('arrhythmia', '')
+        wait_for_reload(registry)
+    assert len(reloads) == 1 and registry.status()['generation'] == 1
+
+    doctors_csv.write_text('Specialist,Diseases_Treated\nDermatologists,Skin rash; eczema\n')
+    backend.find_specialists('eczema', '')
+    wait_for_reload(registry)
+    assert len(reloads) == 2
+    assert backend.find_specialists('eczema', '')[0]['specialist'] == 'Dermatologists'
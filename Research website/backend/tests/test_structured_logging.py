@@ -0,0 +1,56 @@
+"""The logging pipeline leaves the root logger's other handlers in place."""
+import io
+import json
+import logging
+
+from structured_logging import LoggingPipeline, get_logger
+
+
+def test_pipeline_keeps_existing_handlers():
+    root = logging.getLogger()
+    existing = logging.StreamHandler(io.StringIO())
+    root.addHandler(existing)
+    stream = io.StringIO()
+    pipeline = LoggingPipeline(level='INFO', stream=stream)
+    try:
+        assert existing in root.handlers and pipeline.handler in root.handlers
+        get_logger('test').info('Scored', monthlyIncome=50000, eligibility='Eligible')
+        pipeline.stop()
+    finally:
+        pipeline.close()
+        root.removeHandler(existing)
+
+    assert 'Scored' in existing.stream.getvalue()
+    entry = json.loads(stream.getvalue())
+    assert entry['monthlyIncome'] == '[redacted]' and entry['eligibility'] == 'Eligible'
+    assert pipeline.handler not in root.handlers
+
+
+
+def test_pipeline_leaves_the_shared_record_unchanged():
+    root = logging.getLogger()
+    seen = []
+
+    class Recorder(logging.Handler):
+        def emit(self, record):
+            seen.append((record.fields, record.exc_info is not None, record.args))
+
+    stream = io.StringIO()
+    pipeline = LoggingPipeline(level='INFO', stream=stream)
+    # Runs after the queue handler, so it sees the record the pipeline was given
+    recorder = Recorder()
+    root.addHandler(recorder)
+    try:
+        try:
+            raise RuntimeError('boom')
+        except RuntimeError:
+            get_logger('test').exception('Failed for %s', 'applicant', monthlyIncome=50000)
+        pipeline.stop()
+    finally:
+        root.removeHandler(recorder)
+        pipeline.close()
+
+    assert seen == [({'monthlyIncome': 50000}, True, ('applicant',))]
+    entry = json.loads(stream.getvalue())
+    assert entry['monthlyIncome'] == '[redacted]'
+    assert entry['message'] == 'Failed for applicant' and 'RuntimeError: boom' in entry['exception']
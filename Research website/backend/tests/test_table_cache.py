@@ -0,0 +1,63 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import table_cache
+
+HOSPITALS_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models', 'All_Hospital list.csv')
+
+
+@pytest.fixture
+def hospitals_csv(tmp_path):
+    path = tmp_path / 'All_Hospital list.csv'
+    shutil.copy(HOSPITALS_CSV, path)
+    return str(path)
+
+
+def test_cache_matches_csv(hospitals_csv):
+    ingested = table_cache.load_table(hospitals_csv)
+    cached = table_cache.read_cache(table_cache.cache_path_for(hospitals_csv), table_cache.file_digest(hospitals_csv))
+
+    assert cached is not None
+    pd.testing.assert_frame_equal(cached.astype(object), pd.read_csv(hospitals_csv, encoding='latin-1').astype(object))
+    pd.testing.assert_frame_equal(cached, ingested.astype(cached.dtypes.to_dict()))
+    assert isinstance(cached['District'].dtype, pd.CategoricalDtype)
+
+
+def test_csv_edit_is_reingested(hospitals_csv):
+    table_cache.load_table(hospitals_csv)
+    with open(hospitals_csv, 'a', encoding='latin-1') as f:
+        f.write('Private,New Hospital,Colombo\n')
+
+    df = table_cache.load_table(hospitals_csv)
+    assert df.iloc[-1].tolist() == ['Private', 'New Hospital', 'Colombo']
+
+
+@pytest.mark.parametrize('keep_bytes', [0, 100, -100])
+def test_truncated_cache_is_reingested(hospitals_csv, keep_bytes):
+    table_cache.load_table(hospitals_csv)
+    cache_path = table_cache.cache_path_for(hospitals_csv)
+    with open(cache_path, 'rb') as f:
+        data = f.read()
+    with open(cache_path, 'wb') as f:
+        f.write(data[:keep_bytes])
+
+    df = table_cache.load_table(hospitals_csv)
+    assert len(df) == len(pd.read_csv(hospitals_csv, encoding='latin-1'))
+    # The cache was rewritten and is readable again
+    assert table_cache.read_cache(cache_path, table_cache.file_digest(hospitals_csv)) is not None
+
+
+def test_ingest_leaves_no_temporary_files(hospitals_csv):
+    table_cache.load_table(hospitals_csv)
+    cache_dir = os.path.dirname(table_cache.cache_path_for(hospitals_csv))
+    assert os.listdir(cache_dir) == [os.path.basename(table_cache.cache_path_for(hospitals_csv))]
+
+
+def test_missing_column_is_rejected(tmp_path):
+    path = tmp_path / 'All_Hospital list.csv'
+    path.write_text('Type,Hospital\nGovernment,X\n')
+    with pytest.raises(ValueError, match='missing column'):
+        table_cache.load_table(str(path))
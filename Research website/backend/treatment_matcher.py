@@ -0,0 +1,112 @@
+"""
+Treatment recommendations from condition keyword rules.
+
+Rules live in a JSON file: each names a condition, the keywords that identify it and
+its treatments in priority order. Keywords match whole words (``pain`` does not match
+``painful``); a trailing ``*`` makes a keyword a word prefix (``gastro*`` matches
+``gastroenteritis``). All keywords are compiled into hash tables keyed by word
+sequence, so matching is one pass over the request's words with a few lookups per
+word, however many rules there are.
+"""
+import json
+import re
+
+# Anything but letters and digits separates words
+NON_WORD = re.compile(r'[^0-9a-z]+')
+
+# Keyword hits in the stated condition count more than hits in the symptoms
+CONDITION_WEIGHT = 2
+SYMPTOM_WEIGHT = 1
+
+
+def words(text):
+    return NON_WORD.sub(' ', text.lower()).split()
+
+
+class TreatmentMatcher:
+    """Condition rules compiled into keyword lookup tables.
+
+    ``match`` ranks the matched rules by weighted keyword hits (ties keep file order)
+    and returns their treatments in that order, without duplicates.
+    """
+
+    def __init__(self, rules, max_treatments=6):
+        self.max_treatments = max_treatments
+        self.conditions = []
+        self.treatments = []
+        # 'high blood pressure' -> indexes of the rules it identifies
+        self.phrases = {}
+        # 'gastro' -> indexes of the rules with the keyword 'gastro*'
+        self.prefixes = {}
+
+        for index, rule in enumerate(rules):
+            condition = rule.get('condition')
+            keywords = rule.get('keywords')
+            treatments = rule.get('treatments')
+            if not condition or not keywords or not treatments:
+                raise ValueError(f'Treatment rule {index} needs a condition, keywords and treatments')
+            self.conditions.append(condition)
+            self.treatments.append(tuple(treatments))
+
+            for keyword in keywords:
+                is_prefix = keyword.endswith('*')
+                phrase = ' '.join(words(keyword.rstrip('*')))
+                if not phrase:
+                    raise ValueError(f'Treatment rule {condition!r} has an empty keyword')
+                if is_prefix and ' ' in phrase:
+                    raise ValueError(f'Treatment rule {condition!r}: prefix keywords must be a single word')
+                table = self.prefixes if is_prefix else self.phrases
+                rule_indexes = table.setdefault(phrase, [])
+                if index not in rule_indexes:
+                    rule_indexes.append(index)
+
+        # Word counts of multi-word phrases and lengths of prefixes, longest first
+        self.phrase_sizes = sorted({phrase.count(' ') + 1 for phrase in self.phrases} - {1}, reverse=True)
+        self.prefix_lengths = sorted({len(prefix) for prefix in self.prefixes}, reverse=True)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            content = json.load(f)
+        return cls(content['rules'], content.get('max_treatments', 6))
+
+    def keywords_in(self, text):
+        """Set of (table, keyword) occurring in ``text``"""
+        phrases, prefixes = self.phrases, self.prefixes
+        tokens = words(text)
+        found = set()
+        for position, word in enumerate(tokens):
+            if word in phrases:
+                found.add((0, word))
+            for size in self.phrase_sizes:
+                if position + size <= len(tokens):
+                    phrase = ' '.join(tokens[position:position + size])
+                    if phrase in phrases:
+                        found.add((0, phrase))
+            for length in self.prefix_lengths:
+                if word[:length] in prefixes:
+                    found.add((1, word[:length]))
+        return found
+
+    def rank(self, condition, symptoms):
+        """Indexes of the matched rules, best first"""
+        scores = {}
+        for text, weight in ((condition, CONDITION_WEIGHT), (symptoms, SYMPTOM_WEIGHT)):
+            for table, keyword in self.keywords_in(text):
+                for index in (self.prefixes if table else self.phrases)[keyword]:
+                    scores[index] = scores.get(index, 0) + weight
+        return sorted(scores, key=lambda index: (-scores[index], index))
+
+    def match(self, condition, symptoms):
+        """Up to ``max_treatments`` treatments of the matched rules, best rule first; [] if none match"""
+        treatments = []
+        seen = set()
+        for index in self.rank(condition, symptoms):
+            for treatment in self.treatments[index]:
+                key = treatment.lower()
+                if key not in seen:
+                    seen.add(key)
+                    treatments.append(treatment)
+                    if len(treatments) == self.max_treatments:
+                        return treatments
+        return treatments